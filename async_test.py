@@ -0,0 +1,52 @@
+"""Форма перевода через асинхронный клиент: независимые проверки идут одновременно."""
+import asyncio
+
+from harness.aio import AsyncSession, is_absent, start_transfer, wait_clickable, wait_visible
+from harness.locators import Locators
+
+
+def digits(text):
+    return int("".join(filter(str.isdigit, text)))
+
+
+def test_async_valid_transfer_form(browser, base_url):
+    async def scenario():
+        async with AsyncSession.attach(browser) as session:
+            await start_transfer(session, base_url, balance=5000, reserved=0)
+            card = await wait_visible(session, Locators.CARD_NUMBER_INPUT)
+            # Баланс читается, пока вводится номер карты.
+            balance, _ = await asyncio.gather(
+                session.text(Locators.RUBLE_BALANCE), card.send_keys("1111222233334444"),
+            )
+            amount = await wait_visible(session, Locators.TRANSFER_AMOUNT_INPUT)
+            await amount.clear()
+            await amount.send_keys("100")
+            commission, button = await asyncio.gather(
+                wait_visible(session, Locators.COMMISSION_VALUE), wait_clickable(session, Locators.TRANSFER_BUTTON),
+            )
+            return balance, await commission.text(), await button.is_enabled()
+
+    balance, commission, enabled = asyncio.run(scenario())
+    assert digits(balance) == 5000
+    assert "Комиссия" in commission
+    assert enabled
+
+
+def test_async_insufficient_funds_blocks_transfer(browser, base_url):
+    async def scenario():
+        async with AsyncSession.attach(browser) as session:
+            await start_transfer(session, base_url, balance=1000, reserved=0)
+            card = await wait_visible(session, Locators.CARD_NUMBER_INPUT)
+            await card.send_keys("1111222233334444")
+            amount = await wait_visible(session, Locators.TRANSFER_AMOUNT_INPUT)
+            await amount.clear()
+            await amount.send_keys("1001")
+            # Сообщение об ошибке и отсутствие кнопки проверяются одновременно.
+            error, button_absent = await asyncio.gather(
+                wait_visible(session, Locators.ERROR_MESSAGE), is_absent(session, Locators.TRANSFER_BUTTON),
+            )
+            return await error.text(), button_absent
+
+    error, button_absent = asyncio.run(scenario())
+    assert "Недостаточно средств" in error
+    assert button_absent, "Кнопка 'Перевести' не должна отображаться при нехватке средств"
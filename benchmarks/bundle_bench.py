@@ -0,0 +1,272 @@
+"""Сравнение двух сборок фронтенда: разбор и выполнение бандла и отрисовка формы.
+
+Сборка — каталог с index.html и assets/ или ревизия git (из неё берутся
+index.html, vite.svg и assets/). Сборки раздаются двумя StaticServer и
+загружаются по очереди (A, B, B, A, …) в одном headless Chrome из DriverPool
+с отключённым HTTP-кешем. За каждую загрузку снимаются:
+
+- script_ms, style_layout_ms, task_ms — ScriptDuration, RecalcStyleDuration
+  + LayoutDuration и TaskDuration из CDP Performance.getMetrics;
+- heap_mb — JSHeapUsedSize после сборки мусора;
+- dom_nodes — число элементов документа с открытой формой;
+- card_ms — от начала навигации до появления карточки «Рубли»;
+- commission_ms — от клика по карточке до комиссии на экране (скрипт
+  страницы сразу вводит номер карты, как только появляется поле).
+
+Для каждой метрики печатаются медианы, изменение медианы B относительно A
+с 95% бутстреп-интервалом и разность средних с интервалом Уэлча. Если у
+метрики из GATED нижняя граница бутстреп-интервала выше --threshold,
+сборка B считается регрессией, и скрипт завершается с кодом 1 (гейт перед
+выкладкой):
+
+    python benchmarks/bundle_bench.py [A] [B] [-n 30] [--threshold 5]
+
+По умолчанию A — HEAD, B — рабочее дерево.
+"""
+import argparse
+import io
+import json
+import math
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from harness.drivers import DriverPool  # noqa: E402
+from harness.locators import FIND_JS, Locators, js_locator  # noqa: E402
+from harness.server import StaticServer  # noqa: E402
+
+METRICS = ("script_ms", "style_layout_ms", "task_ms", "heap_mb", "dom_nodes", "card_ms", "commission_ms")
+# Метрики, регрессия которых роняет гейт.
+GATED = ("script_ms", "task_ms", "heap_mb", "card_ms", "commission_ms")
+CARD = "1111222233334444"
+BOOTSTRAP_ROUNDS = 5000
+
+# Ставится до загрузки страницы. Кеш локаторов заводится первым: его
+# наблюдатель должен сбрасывать кеш раньше, чем сработает наш.
+_MARKS_JS = "(() => {" + FIND_JS + """
+const L = %s;
+const marks = window.__fbankMarks = {};
+const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+locatorCache();
+new MutationObserver((records, observer) => {
+    if (marks.card === undefined) {
+        const account = find(L.account);
+        if (!account) return;
+        marks.card = performance.now();
+        marks.clicked = performance.now();
+        account.click();
+        return;
+    }
+    if (!marks.typed) {
+        const input = find(L.card);
+        if (!input) return;
+        marks.typed = true;
+        setValue.call(input, "%s");
+        input.dispatchEvent(new Event("input", {bubbles: true}));
+        return;
+    }
+    if (find(L.commission)) {
+        marks.commission = performance.now() - marks.clicked;
+        observer.disconnect();
+    }
+}).observe(document, {childList: true, subtree: true});
+})();
+""" % (json.dumps({
+    "account": js_locator(Locators.RUBLE_ACCOUNT_CARD),
+    "card": js_locator(Locators.CARD_NUMBER_INPUT),
+    "commission": js_locator(Locators.COMMISSION_VALUE),
+}), CARD)
+
+_RESULT_JS = """
+const [timeoutMs, done] = arguments;
+const started = performance.now();
+(function poll() {
+    const marks = window.__fbankMarks;
+    if (marks && marks.commission !== undefined) {
+        done({card: marks.card, commission: marks.commission, nodes: document.getElementsByTagName("*").length});
+    } else if (performance.now() - started > timeoutMs) {
+        done({failure: marks ? "форма не открылась: " + JSON.stringify(marks) : "скрипт замеров не внедрён"});
+    } else {
+        setTimeout(poll, 20);
+    }
+})();
+"""
+
+
+# --- Сборки ---
+def materialize(source, directory):
+    """Каталог со сборкой: сам source или его содержимое из ревизии git."""
+    if os.path.isfile(os.path.join(source, "index.html")):
+        return source
+    paths = [path for path in ("index.html", "vite.svg", "assets")
+             if subprocess.run(["git", "cat-file", "-e", f"{source}:{path}"], cwd=ROOT,
+                               capture_output=True).returncode == 0]
+    if "index.html" not in paths:
+        raise SystemExit(f"{source}: не каталог сборки и не ревизия git с index.html")
+    archive = subprocess.run(["git", "archive", source, *paths], cwd=ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+    return directory
+
+
+# --- Замеры ---
+def _metrics(driver):
+    return {item["name"]: item["value"] for item in driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]}
+
+
+def _spent(before, after, name):
+    # Счётчики копятся в процессе рендерера; при смене процесса они начинаются заново.
+    value = after.get(name, 0.0)
+    return value - before.get(name, 0.0) if value >= before.get(name, 0.0) else value
+
+
+def measure(driver, url):
+    before = _metrics(driver)
+    driver.get(url)
+    result = driver.execute_async_script(_RESULT_JS, 10000)
+    if "failure" in result:
+        raise RuntimeError(result["failure"])
+    driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+    after = _metrics(driver)
+    return {
+        "script_ms": _spent(before, after, "ScriptDuration") * 1000,
+        "style_layout_ms": (_spent(before, after, "RecalcStyleDuration")
+                            + _spent(before, after, "LayoutDuration")) * 1000,
+        "task_ms": _spent(before, after, "TaskDuration") * 1000,
+        "heap_mb": after.get("JSHeapUsedSize", 0.0) / 2 ** 20,
+        "dom_nodes": result["nodes"],
+        "card_ms": result["card"],
+        "commission_ms": result["commission"],
+    }
+
+
+def prepare(driver):
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    driver.execute_cdp_cmd("Performance.enable", {})
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _MARKS_JS})
+    driver.set_script_timeout(15)
+
+
+def collect(driver, urls, runs, warmup):
+    """Чередует сборки парами A B / B A, чтобы дрейф машины делился поровну."""
+    samples = {name: [] for name in urls}
+    names = list(urls)
+    for index in range(warmup + runs):
+        order = names if index % 2 == 0 else names[::-1]
+        for name in order:
+            values = measure(driver, urls[name])
+            if index >= warmup:
+                samples[name].append(values)
+    return samples
+
+
+# --- Статистика ---
+def bootstrap_ratio(a, b, rounds=BOOTSTRAP_ROUNDS, seed=0):
+    """95% интервал отношения медиан b/a (процентильный бутстреп)."""
+    rng = random.Random(seed)
+    ratios = []
+    for _ in range(rounds):
+        median_a = statistics.median(rng.choices(a, k=len(a)))
+        median_b = statistics.median(rng.choices(b, k=len(b)))
+        if median_a:
+            ratios.append(median_b / median_a)
+    if not ratios:
+        return math.nan, math.nan
+    ratios.sort()
+    return ratios[int(0.025 * len(ratios))], ratios[int(0.975 * len(ratios)) - 1]
+
+
+def _t_quantile(df, p=0.975):
+    """Квантиль распределения Стьюдента (разложение Корниша — Фишера по 1/df)."""
+    z = statistics.NormalDist().inv_cdf(p)
+    return (z + (z ** 3 + z) / (4 * df) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3))
+
+
+def welch_interval(a, b):
+    """95% интервал разности средних b - a по Уэлчу."""
+    var_a, var_b = statistics.variance(a) / len(a), statistics.variance(b) / len(b)
+    diff = statistics.mean(b) - statistics.mean(a)
+    if var_a + var_b == 0:
+        return diff, diff
+    df = (var_a + var_b) ** 2 / (var_a ** 2 / (len(a) - 1) + var_b ** 2 / (len(b) - 1))
+    half = _t_quantile(df) * math.sqrt(var_a + var_b)
+    return diff - half, diff + half
+
+
+def compare(samples_a, samples_b, threshold):
+    """Строки отчёта и список метрик с регрессией."""
+    rows, regressions = [], []
+    for metric in METRICS:
+        a = [values[metric] for values in samples_a]
+        b = [values[metric] for values in samples_b]
+        low, high = bootstrap_ratio(a, b)
+        welch_low, welch_high = welch_interval(a, b)
+        if low > 1 + threshold:
+            verdict = "регрессия"
+            if metric in GATED:
+                regressions.append(metric)
+        elif high < 1 - threshold:
+            verdict = "улучшение"
+        else:
+            verdict = "в пределах порога"
+        median_a, median_b = statistics.median(a), statistics.median(b)
+        change = (median_b / median_a - 1) * 100 if median_a else math.nan
+        rows.append((metric, median_a, median_b, change, (low - 1) * 100, (high - 1) * 100,
+                     welch_low, welch_high, verdict))
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", nargs="?", default="HEAD", help="сборка A: каталог или ревизия git")
+    parser.add_argument("candidate", nargs="?", default=ROOT, help="сборка B: каталог или ревизия git")
+    parser.add_argument("-n", "--runs", type=int, default=30, help="загрузок каждой сборки")
+    parser.add_argument("--warmup", type=int, default=3, help="загрузок без учёта перед замерами")
+    parser.add_argument("--threshold", type=float, default=5, help="допустимое ухудшение медианы, %%")
+    parser.add_argument("--json", help="сохранить сырые замеры в файл")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        roots = {
+            "A": materialize(args.baseline, os.path.join(tmp, "A")),
+            "B": materialize(args.candidate, os.path.join(tmp, "B")),
+        }
+        servers = {name: StaticServer(root).start() for name, root in roots.items()}
+        pool = DriverPool()
+        driver = pool.acquire()
+        try:
+            prepare(driver)
+            urls = {name: f"{server.url}/?balance=30000&reserved=0" for name, server in servers.items()}
+            samples = collect(driver, urls, args.runs, args.warmup)
+        finally:
+            pool.close()
+            for server in servers.values():
+                server.stop()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"baseline": args.baseline, "candidate": args.candidate, "samples": samples}, f, indent=1)
+
+    rows, regressions = compare(samples["A"], samples["B"], args.threshold / 100)
+    print(f"A: {args.baseline}\nB: {args.candidate}\nзагрузок: {args.runs} на сборку\n")
+    print(f"{'метрика':<16}{'A, медиана':>12}{'B, медиана':>12}{'Δ, %':>8}{'95% ДИ Δ, %':>18}"
+          f"{'Уэлч, B-A':>22}  вывод")
+    for metric, median_a, median_b, change, low, high, welch_low, welch_high, verdict in rows:
+        print(f"{metric:<16}{median_a:>12.2f}{median_b:>12.2f}{change:>+8.1f}"
+              f"{f'[{low:+.1f}; {high:+.1f}]':>18}{f'[{welch_low:+.2f}; {welch_high:+.2f}]':>22}  {verdict}")
+    if regressions:
+        sys.exit(f"\nРегрессия сборки B сверх {args.threshold:g}%: {', '.join(regressions)}")
+    print(f"\nРегрессий сверх {args.threshold:g}% нет")
+
+
+if __name__ == "__main__":
+    main()
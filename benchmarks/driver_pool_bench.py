@@ -0,0 +1,57 @@
+"""Сравнение времени прогона: новый Chrome на каждый тест против сессионного пула.
+
+Сервер приложения поднимает сам набор тестов. Мерятся только UI-тесты
+(-m ui), а генеративная проверка ограничена случаями из тест-кейсов
+(--sweep-cases 0): иначе 10000 её случаев заглушают разницу между режимами.
+Аргументы pytest после опций скрипта добавляются к этим и могут их
+переопределить:
+
+    python benchmarks/driver_pool_bench.py [-n 3] [аргументы pytest...]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+SUITE_ARGS = ["-m", "ui", "--sweep-cases", "0"]
+MODES = [
+    ("запуск на каждый тест", ["--fresh-driver"]),
+    ("сессионный пул", []),
+]
+
+
+def run_suite(extra_args):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *SUITE_ARGS, *extra_args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - started, result.returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="число прогонов на режим")
+    args, pytest_args = parser.parse_known_args()
+
+    results = {}
+    for name, mode_args in MODES:
+        times = []
+        for _ in range(args.repeat):
+            elapsed, code = run_suite(mode_args + pytest_args)
+            if code not in (0, 1):
+                sys.exit(f"pytest завершился с кодом {code} в режиме '{name}'")
+            times.append(elapsed)
+        results[name] = times
+
+    print(f"{'режим':<24}{'медиана, s':>12}{'мин, s':>10}{'макс, s':>10}")
+    for name, times in results.items():
+        print(f"{name:<24}{statistics.median(times):>12.2f}{min(times):>10.2f}{max(times):>10.2f}")
+    baseline, pooled = (statistics.median(t) for t in results.values())
+    print(f"\nускорение: x{baseline / pooled:.2f}, экономия {baseline - pooled:.2f} s на прогон")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Сравнение движков: время запуска, память браузера и время каждого UI-теста.
+
+Для каждого движка браузер запускается несколько раз (медиана старта и RSS
+всего дерева процессов драйвера), затем UI-тесты прогоняются в отдельном
+pytest, время тестов берётся из junit-отчёта:
+
+    python benchmarks/engines_bench.py [--engines chrome firefox] [-n 3] [--lean]
+
+Движки, которые не удалось запустить, попадают в отчёт с причиной.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness.drivers import ENGINES, create_driver  # noqa: E402
+from harness.resources import tree_usage  # noqa: E402
+
+
+def measure_startup(engine, repeat, lean=False):
+    startups, memory = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        driver = create_driver(engine, lean)
+        startups.append(time.perf_counter() - started)
+        try:
+            driver.get("about:blank")
+            memory.append(tree_usage(driver.service.process.pid)[0])
+        finally:
+            driver.quit()
+    return statistics.median(startups), statistics.median(memory)
+
+
+def measure_tests(engine, pytest_args):
+    with tempfile.TemporaryDirectory() as tmp:
+        report = os.path.join(tmp, "junit.xml")
+        # Свой каталог кеша: история flaky и кеш результатов основного прогона не трогаются.
+        result = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-m", "ui", "-o", f"cache_dir={tmp}/cache",
+             "--engine", engine, f"--junitxml={report}", *pytest_args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        # 0 и 1 — тесты выполнились (возможно, с падениями), время в отчёте есть.
+        if result.returncode not in (0, 1) or not os.path.exists(report):
+            tail = "\n".join(result.stdout.splitlines()[-5:])
+            raise RuntimeError(f"pytest завершился с кодом {result.returncode}:\n{tail}")
+        cases = ET.parse(report).getroot().iter("testcase")
+        return {f"{case.get('classname')}::{case.get('name')}": float(case.get("time")) for case in cases}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=sorted(ENGINES))
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="запусков браузера на движок")
+    parser.add_argument("--lean", action="store_true", help="экономный профиль запуска (--lean-browser)")
+    args, pytest_args = parser.parse_known_args()
+    if args.lean:
+        pytest_args.append("--lean-browser")
+
+    summary, per_test = {}, {}
+    for engine in args.engines:
+        try:
+            startup, rss = measure_startup(engine, args.repeat, args.lean)
+            per_test[engine] = measure_tests(engine, pytest_args)
+        except Exception as e:
+            print(f"{engine}: пропущен ({type(e).__name__}: {e})")
+            continue
+        summary[engine] = (startup, rss, sum(per_test[engine].values()))
+
+    if not summary:
+        sys.exit("Ни один движок не запустился")
+
+    print(f"\n{'движок':<24}{'старт, s':>10}{'RSS, МБ':>10}{'тесты, s':>10}")
+    for engine, (startup, rss, total) in summary.items():
+        print(f"{engine:<24}{startup:>10.2f}{rss:>10.0f}{total:>10.2f}")
+
+    engines = list(per_test)
+    tests = sorted({name for times in per_test.values() for name in times})
+    print(f"\n{'тест':<60}" + "".join(f"{engine[:14]:>16}" for engine in engines))
+    for name in tests:
+        cells = (per_test[engine].get(name) for engine in engines)
+        print(f"{name[-60:]:<60}" + "".join(f"{t:>16.2f}" if t is not None else f"{'-':>16}" for t in cells))
+
+
+if __name__ == "__main__":
+    main()
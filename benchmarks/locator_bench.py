@@ -0,0 +1,71 @@
+"""Стоимость поиска элемента для каждого локатора: XPath, CSS и кеш резолвера.
+
+Форма открывается с заполненной картой и суммой больше остатка, чтобы на
+странице были все элементы (кроме ошибки валидации). Время меряется внутри
+страницы, без накладных расходов WebDriver:
+
+    python benchmarks/locator_bench.py [-n 2000]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.webdriver.common.by import By  # noqa: E402
+
+from harness.drivers import create_driver  # noqa: E402
+from harness.locators import FIND_JS, all_locators, js_locator  # noqa: E402
+from harness.pages import TransferPage  # noqa: E402
+from harness.server import StaticServer  # noqa: E402
+
+_BENCH_JS = FIND_JS + """
+const [locator, iterations] = arguments;
+function measure(lookup) {
+    const started = performance.now();
+    for (let i = 0; i < iterations; i++) lookup();
+    return (performance.now() - started) * 1000 / iterations;
+}
+const result = {};
+for (let i = 0; i < locator.length; i += 2) {
+    const [by, selector] = [locator[i], locator[i + 1]];
+    result[by] = measure(() => query(by, selector));
+}
+find(locator);
+result.cached = measure(() => find(locator));
+return result;
+"""
+
+
+def variants(locator):
+    """Все пары (by, selector) локатора, включая запасную."""
+    pairs = [tuple(locator)]
+    if locator.fallback:
+        pairs.append(locator.fallback)
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=2000, help="поисков на замер")
+    args = parser.parse_args()
+
+    server = StaticServer()
+    server.start()
+    driver = create_driver()
+    try:
+        TransferPage(driver).open_prefilled(server.url, 1000, 0, "1111222233334444", "5000")
+        print(f"{'локатор':<26}{'XPath, мкс':>12}{'CSS, мкс':>10}{'кеш, мкс':>10}")
+        for name, locator in all_locators().items():
+            timings = driver.execute_script(_BENCH_JS, js_locator(locator), args.iterations)
+            kinds = {by for by, _ in variants(locator)}
+            xpath = f"{timings['xpath']:.2f}" if By.XPATH in kinds else "-"
+            css = f"{timings['css']:.2f}" if By.CSS_SELECTOR in kinds else "-"
+            print(f"{name:<26}{xpath:>12}{css:>10}{timings['cached']:>10.2f}")
+    finally:
+        driver.quit()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
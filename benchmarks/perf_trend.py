@@ -0,0 +1,53 @@
+"""Отчёт о трендах по истории замеров .perf/history.jsonl.
+
+Для каждой ревизии печатается медиана каждой метрики по всем тестам,
+ревизии идут в порядке первого появления в истории:
+
+    python benchmarks/perf_trend.py [--history путь] [--last 10]
+"""
+import argparse
+import collections
+import json
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness.perf import DEFAULT_BUDGETS, HISTORY_PATH  # noqa: E402
+
+
+def load(path):
+    runs = collections.OrderedDict()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            metrics = runs.setdefault(entry["revision"] or "?", collections.defaultdict(list))
+            for name, value in entry["metrics"].items():
+                metrics[name].append(value)
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--last", type=int, default=10, help="сколько последних ревизий показать")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.history):
+        sys.exit(f"История не найдена: {args.history}")
+    runs = list(load(args.history).items())[-args.last:]
+    names = list(DEFAULT_BUDGETS)
+
+    print(f"{'ревизия':<10}" + "".join(f"{name[:14]:>16}" for name in names))
+    print(f"{'бюджет':<10}" + "".join(f"{DEFAULT_BUDGETS[name]:>16.0f}" for name in names))
+    for revision, metrics in runs:
+        cells = []
+        for name in names:
+            values = metrics.get(name)
+            cells.append(f"{statistics.median(values):>16.1f}" if values else f"{'-':>16}")
+        print(f"{revision:<10}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Нагрузка на серверы статики: index.html, JS-бандл и CSS при растущем параллелизме.
+
+Каждый сервер запускается отдельным процессом (чтобы мерить его RSS и не
+делить GIL с клиентом):
+
+- stdlib: python -m http.server, как в старом шаге CI (HTTP/1.0, файлы с диска);
+- threaded: harness.server.StaticServer (ThreadingHTTPServer, файлы в памяти);
+- asyncio: harness.server.AsyncStaticServer (один поток, файлы в памяти).
+
+Клиент на asyncio держит по keep-alive соединению на каждого «клиента» и
+по кругу запрашивает три ресурса:
+
+    python benchmarks/server_bench.py [--concurrency 1 8 32 64] [--seconds 5] [--gzip]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PATHS = ["/index.html", "/assets/index-BUH56GOL.js", "/assets/index-Dy9zO9yl.css"]
+
+SERVERS = {
+    "stdlib": lambda port: [sys.executable, "-m", "http.server", str(port), "--bind", "127.0.0.1",
+                            "--directory", ROOT],
+    "threaded": lambda port: [sys.executable, "-m", "harness.server", "--kind", "threaded", "--port", str(port)],
+    "asyncio": lambda port: [sys.executable, "-m", "harness.server", "--kind", "asyncio", "--port", str(port)],
+}
+
+
+def _free_port():
+    import socket
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_mb(pid):
+    """Текущий и пиковый RSS процесса, МБ (только Linux)."""
+    values = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in ("VmRSS", "VmHWM"):
+                values[name] = int(value.split()[0]) / 1024
+    return values.get("VmRSS", 0.0), values.get("VmHWM", 0.0)
+
+
+async def _fetch(connection, port, path, accept_encoding):
+    """Один запрос; возвращает соединение для следующего (или None, если закрыто)."""
+    if connection is None:
+        connection = await asyncio.open_connection("127.0.0.1", port)
+    reader, writer = connection
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept-Encoding: {accept_encoding}\r\n\r\n".encode()
+    )
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("сервер закрыл соединение")
+    length, keep_alive = 0, status_line.startswith(b"HTTP/1.1")
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name = name.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "connection" and value.strip().lower() == "close":
+            keep_alive = False
+    await reader.readexactly(length)
+    if b" 200 " not in status_line:
+        raise ConnectionError(status_line.decode("latin-1").strip())
+    if not keep_alive:
+        writer.close()
+        return None
+    return connection
+
+
+async def _load(port, concurrency, seconds, accept_encoding):
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(offset):
+        nonlocal errors
+        connection, index = None, offset
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                connection = await _fetch(connection, port, PATHS[index % len(PATHS)], accept_encoding)
+                latencies.append(time.perf_counter() - started)
+            except (OSError, asyncio.IncompleteReadError):
+                errors += 1
+                connection = None
+            index += 1
+        if connection is not None:
+            connection[1].close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(offset) for offset in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def bench(name, concurrency_levels, seconds, accept_encoding):
+    port = _free_port()
+    process = subprocess.Popen(SERVERS[name](port), cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            try:
+                asyncio.run(_fetch(None, port, "/index.html", accept_encoding))
+                break
+            except OSError:
+                time.sleep(0.05)
+        rows = []
+        for concurrency in concurrency_levels:
+            latencies, errors, elapsed = asyncio.run(_load(port, concurrency, seconds, accept_encoding))
+            rss, peak = _rss_mb(process.pid)
+            cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+            rows.append((concurrency, len(latencies) / elapsed, cuts[49], cuts[98], max(latencies, default=0.0),
+                         errors, rss, peak))
+        return rows
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", nargs="+", choices=sorted(SERVERS), default=list(SERVERS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32, 64])
+    parser.add_argument("--seconds", type=float, default=5, help="длительность каждой ступени")
+    parser.add_argument("--gzip", action="store_true", help="запрашивать сжатые варианты")
+    args = parser.parse_args()
+    accept_encoding = "gzip, br" if args.gzip else "identity"
+
+    print(f"{'сервер':<10}{'клиентов':>9}{'RPS':>9}{'p50, мс':>9}{'p99, мс':>9}{'макс, мс':>10}"
+          f"{'ошибки':>8}{'RSS, МБ':>9}{'пик, МБ':>9}")
+    for name in args.servers:
+        for concurrency, rps, p50, p99, worst, errors, rss, peak in bench(
+            name, args.concurrency, args.seconds, accept_encoding
+        ):
+            print(f"{name:<10}{concurrency:>9}{rps:>9.0f}{p50 * 1000:>9.2f}{p99 * 1000:>9.2f}"
+                  f"{worst * 1000:>10.2f}{errors:>8}{rss:>9.1f}{peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import functools
+
+import pytest
+
+from harness import cdp
+from harness.commands import LISTENERS_KEY
+from harness.drivers import CDP_ENGINES, ENGINES, HEADLESS_SHELL_ENV, DriverPool, create_driver
+from harness.pages import TransferPage
+from harness.logic import LogicRuntime, unavailable_reason
+from harness.perf import DEFAULT_BUDGETS, PerfRecorder, parse_budget
+from harness.parallel import parse_shard, parse_workers, run_workers, select_shard
+from harness.server import StaticServer
+
+pytest_plugins = ["harness.timing", "harness.profiler", "harness.writeback", "harness.selection", "harness.forensics", "harness.flaky", "harness.navigation", "harness.resources"]
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("f-bank")
+    group.addoption(
+        "--fresh-driver",
+        action="store_true",
+        default=False,
+        help="Запускать новый Chrome на каждый тест (старое поведение, для сравнения времени).",
+    )
+    group.addoption(
+        "--sweep-cases",
+        type=int,
+        default=10000,
+        help="Число случайных случаев в property_test.py.",
+    )
+    group.addoption(
+        "--sweep-seed",
+        type=int,
+        default=20240601,
+        help="Seed генератора случаев property_test.py.",
+    )
+    group.addoption(
+        "--perf-budget",
+        type=parse_budget,
+        action="append",
+        default=[],
+        metavar="ИМЯ=МС",
+        help="Переопределить бюджет производительности, например load=1500.",
+    )
+    group.addoption(
+        "--fast-setup",
+        action="store_true",
+        default=False,
+        help="Открывать форму перевода по deep link вместо клика по карточке и ввода.",
+    )
+    group.addoption(
+        "--single-page",
+        action="store_true",
+        default=False,
+        help="Одна загрузка приложения на браузер: между кейсами форма перемонтируется "
+        "с новыми balance и reserved.",
+    )
+    group.addoption(
+        "--base-url",
+        default=None,
+        help="Адрес уже запущенного приложения; по умолчанию поднимается свой сервер.",
+    )
+    group.addoption(
+        "--engine",
+        choices=sorted(ENGINES),
+        default="chrome",
+        help="Браузер для UI-тестов; chrome-headless-shell берётся из $%s." % HEADLESS_SHELL_ENV,
+    )
+    group.addoption(
+        "--cdp",
+        action="store_true",
+        default=False,
+        help="Режим CDP: статика из памяти через Fetch, внешние запросы блокируются, "
+        "alert() ловится событием.",
+    )
+    group.addoption(
+        "--workers",
+        type=parse_workers,
+        default=1,
+        help="Число параллельных процессов pytest (число или auto).",
+    )
+    group.addoption(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        help="Запустить только шард K/N (выставляется воркерам автоматически).",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "ui: тесты в настоящем браузере (Selenium)")
+    config.addinivalue_line("markers", "logic: тесты бизнес-логики в jsdom без браузера")
+    config.addinivalue_line("markers", "perf: проверки бюджетов производительности")
+    config.addinivalue_line(
+        "markers", "defect: тест закрепляет известный дефект (в таблице кейса статус остаётся Fail)"
+    )
+    TransferPage.fast_setup = config.getoption("--fast-setup")
+    TransferPage.single_page = config.getoption("--single-page")
+    if config.getoption("--cdp") and config.getoption("--engine") not in CDP_ENGINES:
+        raise pytest.UsageError("--cdp работает только с движками " + ", ".join(CDP_ENGINES))
+
+
+def pytest_cmdline_main(config):
+    workers = config.getoption("--workers")
+    if workers > 1 and config.getoption("--shard") is None:
+        return run_workers(config, workers)
+
+
+def pytest_collection_modifyitems(config, items):
+    for item in items:
+        if "browser" in getattr(item, "fixturenames", ()):
+            item.add_marker(pytest.mark.ui)
+        callspec = getattr(item, "callspec", None)
+        scenario = callspec.params.get("scenario") if callspec else None
+        if getattr(scenario, "defect", False):
+            item.add_marker(pytest.mark.defect)
+
+    shard = config.getoption("--shard")
+    if shard is None:
+        return
+    selected, deselected = select_shard(items, *shard)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+# --- Адрес приложения: свой сервер на свободном порту для каждого воркера ---
+@pytest.fixture(scope="session")
+def base_url(request):
+    url = request.config.getoption("--base-url")
+    if url:
+        yield url.rstrip("/")
+        return
+    if request.config.getoption("--cdp"):
+        # Страницы отдаёт сам браузер из памяти, сервер не нужен.
+        yield cdp.CDP_ORIGIN
+        return
+    server = StaticServer().start()
+    yield server.url
+    server.stop()
+
+
+# --- Приложение в jsdom для тестов логики без браузера ---
+@pytest.fixture(scope="session")
+def logic():
+    reason = unavailable_reason()
+    if reason:
+        pytest.skip(f"Уровень logic недоступен: {reason}")
+    runtime = LogicRuntime()
+    yield runtime
+    runtime.close()
+
+
+# --- Пул драйверов на всю сессию ---
+@pytest.fixture(scope="session")
+def driver_pool(request, base_url):
+    engine = request.config.getoption("--engine")
+    lean = request.config.getoption("--lean-browser")
+    factory = functools.partial(create_driver, engine, lean)
+    if request.config.getoption("--cdp"):
+        factory = functools.partial(cdp.attached_driver, base_url, engine, lean)
+    pool = DriverPool(
+        factory=factory,
+        fresh=request.config.getoption("--fresh-driver"),
+        listeners=request.config.stash.get(LISTENERS_KEY, []),
+        keep_page=request.config.getoption("--single-page"),
+    )
+    request.config._driver_pool = pool
+    yield pool
+    pool.close()
+
+
+# --- Фикстура браузера: берёт драйвер из пула и возвращает его после теста ---
+@pytest.fixture
+def browser(driver_pool):
+    driver = driver_pool.acquire()
+    yield driver
+    driver_pool.release(driver)
+
+
+# --- Замеры производительности с бюджетами ---
+@pytest.fixture
+def perf(browser, request):
+    budgets = {**DEFAULT_BUDGETS, **dict(request.config.getoption("--perf-budget"))}
+    recorder = PerfRecorder(browser, budgets, request.node.nodeid)
+    yield recorder
+    recorder.close()
+    recorder.save()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    pool = getattr(config, "_driver_pool", None)
+    if pool is None:
+        return
+    terminalreporter.write_sep("-", f"драйверы ({config.getoption('--engine')})")
+    terminalreporter.write_line(
+        f"запусков: {pool.launches}, пересоздано после падения: {pool.recycled}, "
+        f"суммарное время старта: {pool.startup_time:.2f} s"
+    )
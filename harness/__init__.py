@@ -0,0 +1 @@
+"""Вспомогательный код для Selenium-тестов F-Bank: драйверы, сервер, ожидания."""
@@ -0,0 +1,370 @@
+"""Асинхронный клиент WebDriver на asyncio: независимые команды без очереди.
+
+Синхронный Selenium ждёт ответа на каждую команду, прежде чем отправить
+следующую. Здесь команды — корутины поверх пула keep-alive соединений
+HTTP/1.1 с драйвером (chromedriver, geckodriver), поэтому независимые
+запросы идут одновременно:
+
+    async with AsyncSession.attach(browser) as session:
+        await start_transfer(session, base_url)
+        card = await wait_visible(session, Locators.CARD_NUMBER_INPUT)
+        balance, _ = await asyncio.gather(
+            session.text(Locators.RUBLE_BALANCE), card.send_keys("1111222233334444"),
+        )
+
+attach подключается к сессии уже запущенного драйвера (например, из
+DriverPool). Так в одном цикле событий можно вести несколько сессий, а
+синхронный код может и дальше работать с тем же драйвером. Ожидания те же,
+что в harness.waits, — MutationObserver в странице. Ошибки драйвера
+превращаются в те же исключения Selenium, что и в синхронном коде.
+"""
+import asyncio
+import collections
+import json
+import time
+from urllib.parse import urlsplit
+
+import pytest
+from selenium.common.exceptions import NoAlertPresentException, NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+
+from harness.locators import Locators, js_locator
+from harness.waits import SCRIPT_TIMEOUT_MARGIN, SETTLE_MS, WAIT_JS
+
+# Ключ ссылки на элемент в протоколе W3C WebDriver.
+ELEMENT_KEY = "element-6066-11e4-a52f-4f735466cecc"
+POOL_SIZE = 4
+ALERT_POLL = 0.05
+
+_errors = ErrorHandler()
+
+
+def _check(status, text):
+    # Как в RemoteConnection: ошибкой считаются только коды 4xx и 5xx.
+    if status >= 400:
+        _errors.check_response({"status": status, "value": text})
+
+
+# --- HTTP: пул keep-alive соединений ---
+class ConnectionPool:
+    """До size соединений HTTP/1.1 с драйвером, переиспользуемых между запросами.
+
+    Пул привязан к циклу событий, в котором выполнен первый запрос.
+    """
+
+    def __init__(self, url, size=POOL_SIZE):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.size = size
+        self.connections = 0
+        self._idle = []
+        self._slots = None
+
+    async def request(self, method, path, payload=None):
+        """Возвращает (код ответа, тело ответа строкой)."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        head = (
+            f"{method} {self.prefix}{path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Accept: application/json\r\n"
+            "Content-Type: application/json;charset=UTF-8\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        ).encode("ascii")
+        async with self._slots:
+            while True:
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await self._connect()
+                try:
+                    writer.write(head + body)
+                    status, text, keep_alive = await self._read_response(reader)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if reused:
+                        # Драйвер закрыл простаивавшее соединение: повтор на новом.
+                        continue
+                    raise
+                except BaseException:
+                    # Например, отмена корутины посреди ответа: соединение не вернуть.
+                    writer.close()
+                    raise
+                if keep_alive:
+                    self._idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status, text
+
+    async def _connect(self):
+        self.connections += 1
+        return await asyncio.open_connection(self.host, self.port)
+
+    @staticmethod
+    async def _read_response(reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("драйвер закрыл соединение")
+        status = int(status_line.split()[1])
+        keep_alive = status_line.startswith(b"HTTP/1.1")
+        length, chunked = None, False
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding":
+                chunked = "chunked" in value
+            elif name == "connection":
+                keep_alive = value != "close"
+        if chunked:
+            parts = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                parts.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b"".join(parts)
+        elif length is not None:
+            body = await reader.readexactly(length)
+        else:
+            body, keep_alive = await reader.read(), False
+        return status, body.decode("utf-8"), keep_alive
+
+    def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle = []
+
+
+# --- Сессия и элементы ---
+class AsyncElement:
+    def __init__(self, session, element_id):
+        self.session = session
+        self.id = element_id
+
+    def _command(self, method, path, payload=None):
+        return self.session.execute(method, f"/element/{self.id}{path}", payload)
+
+    async def click(self):
+        await self._command("POST", "/click", {})
+
+    async def clear(self):
+        await self._command("POST", "/clear", {})
+
+    async def send_keys(self, text):
+        await self._command("POST", "/value", {"text": text, "value": list(text)})
+
+    async def text(self):
+        return await self._command("GET", "/text")
+
+    async def get_attribute(self, name):
+        return await self._command("GET", f"/attribute/{name}")
+
+    async def get_property(self, name):
+        return await self._command("GET", f"/property/{name}")
+
+    async def is_enabled(self):
+        return await self._command("GET", "/enabled")
+
+    def __repr__(self):
+        return f"<AsyncElement {self.id}>"
+
+
+class AsyncSession:
+    """Сессия WebDriver с асинхронными командами.
+
+    owns=True означает, что сессию создал этот клиент и close() её удалит.
+    """
+
+    def __init__(self, pool, session_id, owns=False, driver=None):
+        self.pool = pool
+        self.id = session_id
+        self.owns = owns
+        self.driver = driver
+        self._script_timeout = None
+        self._running = collections.Counter()
+        self._timeout_lock = None
+
+    @classmethod
+    def attach(cls, driver, size=POOL_SIZE):
+        """Подключается к сессии уже запущенного синхронного драйвера Selenium."""
+        service = getattr(driver, "service", None)
+        url = getattr(service, "service_url", None) or driver.command_executor.client_config.remote_server_addr
+        return cls(ConnectionPool(url, size), driver.session_id, driver=driver)
+
+    @classmethod
+    async def create(cls, url, capabilities, size=POOL_SIZE):
+        """Создаёт новую сессию на драйвере по адресу url, например из Options.to_capabilities()."""
+        pool = ConnectionPool(url, size)
+        status, text = await pool.request("POST", "/session", {"capabilities": {"alwaysMatch": capabilities}})
+        _check(status, text)
+        return cls(pool, json.loads(text)["value"]["sessionId"], owns=True)
+
+    async def close(self):
+        if self.driver is not None and self._script_timeout is not None:
+            # Таймаут скриптов сессии менялся мимо синхронного драйвера:
+            # harness.waits.set_script_timeout должен выставить его заново.
+            self.driver.__dict__.pop("_fbank_script_timeout", None)
+        try:
+            if self.owns:
+                await self.pool.request("DELETE", f"/session/{self.id}")
+        finally:
+            self.pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def execute(self, method, path, payload=None):
+        """Команда сессии; ошибки драйвера — исключения Selenium."""
+        status, text = await self.pool.request(method, f"/session/{self.id}{path}", payload)
+        _check(status, text)
+        return self._unwrap(json.loads(text)["value"])
+
+    def _unwrap(self, value):
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncElement(self, value[ELEMENT_KEY])
+            return {key: self._unwrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        return value
+
+    @staticmethod
+    def _wrap(value):
+        if isinstance(value, AsyncElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [AsyncSession._wrap(item) for item in value]
+        return value
+
+    # --- Навигация и скрипты ---
+    async def get(self, url):
+        await self.execute("POST", "/url", {"url": url})
+
+    async def title(self):
+        return await self.execute("GET", "/title")
+
+    async def execute_script(self, script, *args):
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": self._wrap(args)})
+
+    async def execute_async_script(self, script, *args, timeout=None):
+        if timeout is None:
+            return await self.execute("POST", "/execute/async", {"script": script, "args": self._wrap(args)})
+        # Таймаут общий для сессии: выставляется наибольший из идущих сейчас
+        # скриптов и снова уменьшается, когда длинные ожидания закончились.
+        if self._timeout_lock is None:
+            self._timeout_lock = asyncio.Lock()
+        self._running[timeout] += 1
+        try:
+            async with self._timeout_lock:
+                needed = max(self._running)
+                if needed != self._script_timeout:
+                    self._script_timeout = needed
+                    await self.execute("POST", "/timeouts", {"script": int(needed * 1000)})
+            return await self.execute("POST", "/execute/async", {"script": script, "args": self._wrap(args)})
+        finally:
+            self._running[timeout] -= 1
+            if not self._running[timeout]:
+                del self._running[timeout]
+
+    # --- Поиск по Locator с запасным селектором ---
+    async def _find(self, by, value):
+        return await self.execute("POST", "/element", {"using": by, "value": value})
+
+    async def find_element(self, locator):
+        try:
+            return await self._find(*locator)
+        except NoSuchElementException:
+            fallback = getattr(locator, "fallback", None)
+            if fallback is None:
+                raise
+            return await self._find(*fallback)
+
+    async def text(self, locator):
+        return await (await self.find_element(locator)).text()
+
+    # --- alert ---
+    async def alert_text(self):
+        return await self.execute("GET", "/alert/text")
+
+    async def accept_alert(self):
+        await self.execute("POST", "/alert/accept", {})
+
+    async def dismiss_alert(self):
+        await self.execute("POST", "/alert/dismiss", {})
+
+
+# --- Ожидания (как в harness.waits) ---
+async def _run(session, locator, condition, timeout, text=""):
+    return await session.execute_async_script(
+        WAIT_JS, js_locator(locator), condition, text, int(timeout * 1000), SETTLE_MS,
+        timeout=timeout + SCRIPT_TIMEOUT_MARGIN,
+    )
+
+
+async def _wait(session, locator, condition, timeout, text=""):
+    element = await _run(session, locator, condition, timeout, text)
+    if element is None:
+        raise TimeoutException(f"Условие '{condition}' не выполнилось за {timeout} s для {locator}")
+    return element
+
+
+async def wait_present(session, locator, timeout=10):
+    return await _wait(session, locator, "present", timeout)
+
+
+async def wait_visible(session, locator, timeout=10):
+    return await _wait(session, locator, "visible", timeout)
+
+
+async def wait_clickable(session, locator, timeout=10):
+    return await _wait(session, locator, "clickable", timeout)
+
+
+async def wait_text(session, locator, text, timeout=10):
+    return await _wait(session, locator, "text", timeout, text)
+
+
+async def is_absent(session, locator, timeout=2):
+    """Быстрая отрицательная проверка: ждёт окончания рендера, а не таймаута."""
+    return await _run(session, locator, "absent", timeout)
+
+
+async def wait_settled(session, timeout=2):
+    """Ждёт, пока DOM перестанет меняться, то есть React закончит рендер."""
+    await _run(session, (By.CSS_SELECTOR, ":root"), "settled", timeout)
+
+
+async def wait_alert(session, timeout=10):
+    """Текст открытого alert; alert() в обработчике клика обычно уже открыт."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return await session.alert_text()
+        except NoAlertPresentException:
+            if time.monotonic() > deadline:
+                raise TimeoutException(f"alert не появился за {timeout} s") from None
+            await asyncio.sleep(ALERT_POLL)
+
+
+# --- Вспомогательная функция для начала перевода ---
+async def start_transfer(session, base_url, balance=30000, reserved=20001):
+    await session.get(f"{base_url}/?balance={balance}&reserved={reserved}")
+    try:
+        account = await wait_clickable(session, Locators.RUBLE_ACCOUNT_CARD, timeout=15)
+    except TimeoutException:
+        # Снимок экрана и DOM сохраняет плагин harness.forensics.
+        pytest.fail("Не удалось найти карточку 'Рубли' для начала теста. Смотрите артефакты теста.")
+    await account.click()
+    return session
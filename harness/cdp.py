@@ -0,0 +1,202 @@
+"""Режим Chrome DevTools Protocol: статика из памяти и перехват alert().
+
+Драйвер подключается к своей вкладке отдельным websocket-соединением CDP
+(пакет websocket-client ставится вместе с selenium):
+
+- Fetch.requestPaused: запросы к адресу приложения отдаются из load_site()
+  без сервера, любые другие http(s)-запросы блокируются;
+- Page.javascriptDialogOpening: открытые диалоги записываются по событию,
+  wait_alert ждёт их на условной переменной, а не опросом WebDriver.
+
+Диалог не закрывается: принимать его по-прежнему можно через switch_to.alert.
+"""
+import base64
+import itertools
+import json
+import threading
+import urllib.request
+
+import websocket
+from selenium.common.exceptions import UnexpectedAlertPresentException
+from selenium.webdriver.remote.command import Command
+
+from harness.drivers import create_driver
+from harness.server import ROOT, load_site
+
+# Адрес приложения в режиме CDP: сервер не нужен, домен никогда не резолвится.
+CDP_ORIGIN = "http://f-bank.test"
+
+_COMMAND_TIMEOUT = 10
+_DIALOG_COMMANDS = (Command.W3C_ACCEPT_ALERT, Command.W3C_DISMISS_ALERT)
+
+
+class CdpError(RuntimeError):
+    pass
+
+
+class DialogRecorder:
+    """История диалогов страницы и текущий открытый диалог."""
+
+    def __init__(self):
+        self.history = []
+        self.current = None
+        self._changed = threading.Condition()
+
+    def opened(self, params):
+        with self._changed:
+            self.current = {"type": params.get("type"), "message": params.get("message", "")}
+            self.history.append(self.current)
+            self._changed.notify_all()
+
+    def closed(self, params=None):
+        with self._changed:
+            self.current = None
+            self._changed.notify_all()
+
+    def wait(self, timeout):
+        """Открытый диалог или None, если за timeout секунд он не появился."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.current is not None, timeout)
+            return self.current
+
+
+class CdpSession:
+    """Соединение CDP с вкладкой драйвера: команды, события и фоновое чтение."""
+
+    def __init__(self, driver):
+        address = driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+        with urllib.request.urlopen(f"http://{address}/json", timeout=_COMMAND_TIMEOUT) as response:
+            targets = json.load(response)
+        page = next(target for target in targets if target["type"] == "page")
+        self._ws = websocket.create_connection(
+            page["webSocketDebuggerUrl"], timeout=_COMMAND_TIMEOUT, suppress_origin=True
+        )
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._handlers = {}
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def on(self, event, handler):
+        self._handlers[event] = handler
+
+    def send(self, method, params=None):
+        """Отправляет команду, не дожидаясь ответа (можно звать из обработчиков)."""
+        with self._lock:
+            message_id = next(self._ids)
+            self._ws.send(json.dumps({"id": message_id, "method": method, "params": params or {}}))
+        return message_id
+
+    def call(self, method, params=None):
+        reply = {"event": threading.Event()}
+        with self._lock:
+            message_id = next(self._ids)
+            self._pending[message_id] = reply
+            self._ws.send(json.dumps({"id": message_id, "method": method, "params": params or {}}))
+        if not reply["event"].wait(_COMMAND_TIMEOUT):
+            raise CdpError(f"{method}: нет ответа за {_COMMAND_TIMEOUT} s")
+        if "error" in reply:
+            raise CdpError(f"{method}: {reply['error'].get('message')}")
+        return reply.get("result", {})
+
+    def _read(self):
+        while True:
+            try:
+                message = json.loads(self._ws.recv())
+            except (websocket.WebSocketException, OSError):
+                return
+            if "id" in message:
+                with self._lock:
+                    reply = self._pending.pop(message["id"], None)
+                if reply is not None:
+                    reply.update(message)
+                    reply["event"].set()
+                continue
+            handler = self._handlers.get(message.get("method"))
+            if handler is not None:
+                handler(message.get("params", {}))
+
+    def close(self):
+        try:
+            self._ws.close()
+        except (websocket.WebSocketException, OSError):
+            pass
+        self._reader.join(timeout=1)
+
+
+class CdpMode:
+    """Раздача статики из памяти и запись диалогов для одного драйвера."""
+
+    def __init__(self, driver, origin=CDP_ORIGIN, root=ROOT):
+        self.origin = origin.rstrip("/")
+        self.site = load_site(root)
+        self.dialogs = DialogRecorder()
+        self.served = 0
+        self.blocked = []
+        self.session = CdpSession(driver)
+        self.session.on("Fetch.requestPaused", self._request_paused)
+        self.session.on("Page.javascriptDialogOpening", self.dialogs.opened)
+        self.session.on("Page.javascriptDialogClosed", self.dialogs.closed)
+        self.session.call("Page.enable")
+        self.session.call("Fetch.enable", {"patterns": [{"urlPattern": "http*", "requestStage": "Request"}]})
+
+    def _request_paused(self, params):
+        request_id = params["requestId"]
+        url = params["request"]["url"]
+        if not url.startswith(self.origin + "/"):
+            self.blocked.append(url)
+            self.session.send("Fetch.failRequest", {"requestId": request_id, "errorReason": "BlockedByClient"})
+            return
+        path = url[len(self.origin):].split("?", 1)[0].split("#", 1)[0]
+        resource = self.site.get(path)
+        if resource is None:
+            self.session.send("Fetch.fulfillRequest", {"requestId": request_id, "responseCode": 404})
+            return
+        self.served += 1
+        self.session.send("Fetch.fulfillRequest", {
+            "requestId": request_id,
+            "responseCode": 200,
+            "responseHeaders": [
+                {"name": "Content-Type", "value": resource.content_type},
+                {"name": "Cache-Control", "value": resource.cache_control},
+                {"name": "ETag", "value": resource.etag},
+            ],
+            "body": base64.b64encode(resource.variants["identity"]).decode("ascii"),
+        })
+
+    def close(self):
+        self.session.close()
+
+
+def attached_driver(origin=CDP_ORIGIN, engine="chrome", lean=False):
+    """Новый драйвер в режиме CDP; сам режим доступен как driver.fbank_cdp.
+
+    Соединение CDP закрывается вместе с браузером, отдельно его закрывать не нужно.
+    """
+    driver = create_driver(engine, lean)
+    driver.fbank_cdp = CdpMode(driver, origin)
+    _track_dialog_handling(driver, driver.fbank_cdp.dialogs)
+    return driver
+
+
+def _track_dialog_handling(driver, dialogs):
+    """Закрытый через WebDriver диалог снимается с записи сразу, без события CDP.
+
+    Page.javascriptDialogClosed приходит асинхронно: без этого wait_alert сразу
+    после accept() вернул бы уже закрытый диалог.
+    """
+    original = driver.execute
+
+    def execute(driver_command, params=None):
+        try:
+            result = original(driver_command, params)
+        except UnexpectedAlertPresentException:
+            # Драйвер сам закрыл неожиданный диалог.
+            dialogs.closed()
+            raise
+        if driver_command in _DIALOG_COMMANDS:
+            dialogs.closed()
+        return result
+
+    driver.execute = execute
@@ -0,0 +1,40 @@
+"""Перехват команд WebDriver для плагинов, которым нужна каждая команда.
+
+instrument() оборачивает driver.execute: после каждой команды слушатели
+получают (command, params, duration, error). Плагины регистрируют
+слушателей в config.stash[LISTENERS_KEY], пул драйверов подключает их к
+каждому новому драйверу.
+"""
+import time
+
+import pytest
+
+LISTENERS_KEY = pytest.StashKey[list]()
+
+# Псевдокоманда для времени запуска браузера (до появления сессии).
+LAUNCH_COMMAND = "launchBrowser"
+
+
+def instrument(driver, listeners):
+    original = driver.execute
+
+    def execute(driver_command, params=None):
+        started = time.perf_counter()
+        error = None
+        try:
+            return original(driver_command, params)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            for listener in listeners:
+                listener(driver_command, params, duration, error)
+
+    driver.execute = execute
+    return driver
+
+
+def notify_launch(listeners, duration):
+    for listener in listeners:
+        listener(LAUNCH_COMMAND, None, duration, None)
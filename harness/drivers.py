@@ -0,0 +1,245 @@
+"""Создание драйверов (Chrome, Firefox, chrome-headless-shell) и сессионный пул."""
+import os
+import threading
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.common.exceptions import WebDriverException, NoAlertPresentException
+
+from harness.commands import instrument, notify_launch
+
+# Путь к chrome-headless-shell; без него движок headless-shell недоступен.
+HEADLESS_SHELL_ENV = "FBANK_HEADLESS_SHELL"
+
+
+# Экономный профиль запуска (--lean-browser): окно меньше, без GPU и
+# расширений, без фоновых служб, и все вкладки в одном процессе рендерера.
+# Формы приложения укладываются в 1280x800.
+LEAN_WINDOW = (1280, 800)
+_LEAN_CHROME_ARGS = (
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--mute-audio",
+    "--no-first-run",
+    "--renderer-process-limit=1",
+    "--disable-features=site-per-process,Translate,MediaRouter,OptimizationHints",
+)
+_LEAN_FIREFOX_PREFS = {
+    "dom.ipc.processCount": 1,
+    "fission.autostart": False,
+    "extensions.update.enabled": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "media.hardware-video-decoding.enabled": False,
+}
+
+
+# --- Настройки запуска Chrome (для CI) ---
+def chrome_options(headless="--headless=new", lean=False):
+    chrome_options = Options()
+    chrome_options.add_argument(headless)
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    if lean:
+        chrome_options.add_argument("--window-size=%d,%d" % LEAN_WINDOW)
+        for argument in _LEAN_CHROME_ARGS:
+            chrome_options.add_argument(argument)
+    else:
+        chrome_options.add_argument("--window-size=1920,1080")
+    return chrome_options
+
+
+def _chrome(lean=False):
+    print("\nНастройка драйвера для Chrome (для CI)")
+    return webdriver.Chrome(options=chrome_options(lean=lean))
+
+
+def _firefox(lean=False):
+    print("\nНастройка драйвера для Firefox")
+    options = FirefoxOptions()
+    options.add_argument("-headless")
+    width, height = LEAN_WINDOW if lean else (1920, 1080)
+    options.add_argument(f"--width={width}")
+    options.add_argument(f"--height={height}")
+    if lean:
+        for name, value in _LEAN_FIREFOX_PREFS.items():
+            options.set_preference(name, value)
+    return webdriver.Firefox(options=options)
+
+
+def _headless_shell(lean=False):
+    # Отдельная сборка Chromium без UI: стартует быстрее и занимает меньше памяти.
+    binary = os.environ.get(HEADLESS_SHELL_ENV)
+    if not binary:
+        raise RuntimeError(f"Для движка chrome-headless-shell укажите путь к нему в {HEADLESS_SHELL_ENV}")
+    print("\nНастройка драйвера для chrome-headless-shell")
+    options = chrome_options(headless="--headless", lean=lean)
+    options.binary_location = binary
+    return webdriver.Chrome(options=options)
+
+
+ENGINES = {
+    "chrome": _chrome,
+    "firefox": _firefox,
+    "chrome-headless-shell": _headless_shell,
+}
+# Движки с Chrome DevTools Protocol (execute_cdp_cmd, режим --cdp).
+CDP_ENGINES = ("chrome", "chrome-headless-shell")
+
+
+def create_driver(engine="chrome", lean=False):
+    return ENGINES[engine](lean=lean)
+
+
+# JS для очистки хранилищ; на about:blank доступ к ним бросает SecurityError.
+_CLEAR_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+# Снимает форму с загруженного приложения (маршрут /__reset, как в
+# TransferPage.reopen), не выгружая страницу; false, если приложения нет.
+_UNMOUNT_JS = """
+if (!document.getElementById("root")) return false;
+history.replaceState(null, "", "/__reset");
+dispatchEvent(new PopStateEvent("popstate", {state: null}));
+return true;
+"""
+
+
+def reset_state(driver, keep_page=False):
+    """Возвращает браузер в чистое состояние между тестами.
+
+    С keep_page загруженное приложение остаётся на странице без формы:
+    следующий тест перемонтирует его вместо новой загрузки.
+    """
+    try:
+        driver.switch_to.alert.dismiss()
+    except NoAlertPresentException:
+        pass
+    driver.execute_script(_CLEAR_STORAGE_JS)
+    driver.delete_all_cookies()
+    if keep_page and driver.execute_script(_UNMOUNT_JS):
+        return
+    driver.get("about:blank")
+
+
+class DriverPool:
+    """Пул драйверов на всю сессию pytest.
+
+    Браузер запускается один раз и переиспользуется между тестами; после
+    каждого теста состояние сбрасывается через reset_state. Драйвер
+    пересоздаётся, если он упал (сброс закончился WebDriverException) или
+    был помечен через retire, например при превышении потолка памяти.
+    """
+
+    def __init__(self, factory=create_driver, fresh=False, listeners=(), keep_page=False):
+        self._factory = factory
+        self._fresh = fresh
+        self._keep_page = keep_page
+        self._listeners = list(listeners)
+        self._idle = []
+        self._busy = set()
+        self._retired = set()
+        self._lock = threading.Lock()
+        self.launches = 0
+        self.recycled = 0
+        self.startup_time = 0.0
+
+    def acquire(self):
+        with self._lock:
+            driver = self._idle.pop() if self._idle else None
+        if driver is None:
+            started = time.perf_counter()
+            driver = self._factory()
+            startup = time.perf_counter() - started
+            with self._lock:
+                self.startup_time += startup
+                self.launches += 1
+            if self._listeners:
+                notify_launch(self._listeners, startup)
+                instrument(driver, self._listeners)
+        with self._lock:
+            self._busy.add(driver)
+        return driver
+
+    def in_use(self):
+        """Драйверы, выданные тестам и ещё не возвращённые."""
+        with self._lock:
+            return list(self._busy)
+
+    def idle(self):
+        """Свободные драйверы пула."""
+        with self._lock:
+            return list(self._idle)
+
+    def discard_idle(self):
+        """Закрывает свободные драйверы: следующий тест получит новый браузер."""
+        with self._lock:
+            drivers, self._idle = self._idle, []
+        self.recycled += len(drivers)
+        for driver in drivers:
+            self._quit(driver)
+
+    def retire(self, driver):
+        """Помечает драйвер: при возврате в пул он закрывается, а не переиспользуется."""
+        with self._lock:
+            if driver in self._busy:
+                self._retired.add(driver)
+                return
+            if driver not in self._idle:
+                return
+            self._idle.remove(driver)
+        self.recycled += 1
+        self._quit(driver)
+
+    def release(self, driver):
+        with self._lock:
+            self._busy.discard(driver)
+            retired = driver in self._retired
+            self._retired.discard(driver)
+        if retired:
+            self.recycled += 1
+            self._quit(driver)
+            return
+        if self._fresh:
+            self._quit(driver)
+            return
+        try:
+            reset_state(driver, self._keep_page)
+        except WebDriverException:
+            print("\nДрайвер упал, он будет пересоздан")
+            self.recycled += 1
+            self._quit(driver)
+            return
+        with self._lock:
+            self._idle.append(driver)
+
+    def discard(self, driver):
+        """Закрывает драйвер без возврата в пул, например после его падения."""
+        with self._lock:
+            self._busy.discard(driver)
+        self.recycled += 1
+        self._quit(driver)
+
+    def close(self):
+        with self._lock:
+            drivers = self._idle + list(self._busy)
+            self._idle, self._busy = [], set()
+        for driver in drivers:
+            self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        print("\nЗакрытие драйвера")
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -0,0 +1,199 @@
+"""Плагин pytest: поиск нестабильных тестов, повторы и карантин.
+
+Для каждого теста в кеше pytest хранится история последних прогонов:
+исход (passed, failed или flaky — прошёл только при повторе) и время
+фазы call. По ней:
+
+- упавший тест повторяется (до --flaky-retries раз), только если в его
+  истории уже есть нестабильность: flaky-исход или падения вперемешку
+  с успехами. Новый тест и тест, который падает всегда, не повторяются,
+  как и тест, упавший ещё в setup: сломанное окружение повтор не чинит.
+  Перед повтором снимаются все фикстуры ниже сессии (и модульные, которые
+  держат драйвер), драйверы пула закрываются, и тест получает только что
+  запущенный браузер;
+- тест с частыми flaky-исходами или большим разбросом времени попадает
+  в карантин: выполняется как xfail(strict=False) и без повторов, так что
+  его падение или затяжной повтор не держит весь прогон.
+"""
+import hashlib
+import statistics
+
+import pytest
+from _pytest.runner import runtestprotocol
+
+CACHE_PREFIX = "fbank/flaky/"
+HISTORY = 20
+MIN_SAMPLES = 5
+FLAKY_RATE = 0.2
+# Коэффициент вариации времени (stdev / mean), выше которого тест нестабилен.
+CV_LIMIT = 0.5
+# Разброс у тестов короче этого (с) — шум, на прогон он не влияет.
+MIN_MEAN = 0.5
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("f-bank")
+    group.addoption(
+        "--flaky-retries",
+        type=int,
+        default=2,
+        help="Сколько раз повторять упавший тест с нестабильной историей.",
+    )
+    group.addoption(
+        "--no-quarantine",
+        action="store_true",
+        default=False,
+        help="Не помечать нестабильные тесты как xfail.",
+    )
+    group.addoption(
+        "--flaky-report",
+        action="store_true",
+        default=False,
+        help="Показать статистику нестабильности тестов по истории прогонов.",
+    )
+
+
+def pytest_configure(config):
+    if getattr(config, "cache", None) is not None:
+        config.pluginmanager.register(FlakyTracker(config), "fbank-flaky")
+
+
+def stats(history):
+    """Доля flaky/failed исходов и коэффициент вариации времени по истории."""
+    outcomes = [outcome for outcome, _ in history]
+    durations = [duration for outcome, duration in history if outcome != "failed"]
+    unstable = sum(outcome == "flaky" for outcome in outcomes)
+    if "passed" in outcomes or unstable:
+        # Падения вперемешку с успехами — тоже признак нестабильности.
+        unstable += outcomes.count("failed")
+    mean = statistics.mean(durations) if durations else 0.0
+    cv = statistics.pstdev(durations) / mean if len(durations) > 1 and mean > 0 else 0.0
+    return {
+        "runs": len(history),
+        "flaky_rate": unstable / len(history) if history else 0.0,
+        "mean": mean,
+        "cv": cv,
+    }
+
+
+def quarantine_reason(history):
+    if len(history) < MIN_SAMPLES:
+        return None
+    summary = stats(history)
+    if summary["flaky_rate"] >= FLAKY_RATE:
+        return f"карантин: нестабильных исходов {summary['flaky_rate']:.0%} за {summary['runs']} прогонов"
+    if summary["mean"] >= MIN_MEAN and summary["cv"] > CV_LIMIT:
+        return f"карантин: разброс времени {summary['cv']:.2f} (среднее {summary['mean']:.2f} s)"
+    return None
+
+
+class FlakyTracker:
+    def __init__(self, config):
+        self.config = config
+        self.retries = config.getoption("--flaky-retries")
+        self.quarantine = not config.getoption("--no-quarantine")
+        self.history = {}
+        self.quarantined = set()
+        self.current = {}
+
+    def _cache_key(self, nodeid):
+        return CACHE_PREFIX + hashlib.sha1(nodeid.encode("utf-8")).hexdigest()[:20]
+
+    def pytest_collection_modifyitems(self, items):
+        for item in items:
+            history = self.config.cache.get(self._cache_key(item.nodeid), [])
+            self.history[item.nodeid] = history
+            reason = quarantine_reason(history) if self.quarantine else None
+            if reason:
+                item.add_marker(pytest.mark.xfail(reason=reason, strict=False))
+                self.quarantined.add(item.nodeid)
+
+    def _may_retry(self, nodeid):
+        if nodeid in self.quarantined:
+            return False
+        history = self.history.get(nodeid, [])
+        return bool(history) and stats(history)["flaky_rate"] > 0
+
+    def _fresh_driver(self, item):
+        """Возвращает в пул драйверы всех фикстур теста и закрывает их.
+
+        Драйвер может держать и фикстура модуля (scenario_runner), поэтому
+        снимается всё ниже сессии: при повторе фикстуры модуля создаются
+        заново и берут из пула только что запущенный браузер. False, если
+        teardown фикстур упал, — тогда повтора не будет.
+        """
+        try:
+            item.session._setupstate.teardown_exact(item.session)
+        except Exception:
+            return False
+        pool = getattr(self.config, "_driver_pool", None)
+        if pool is not None:
+            pool.discard_idle()
+        return True
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if self.retries <= 0 or not self._may_retry(item.nodeid):
+            return None
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for attempt in range(self.retries + 1):
+            # Каждая попытка снимает фикстуры так, будто она последняя: модульные
+            # остаются, только если следующий тест из того же модуля.
+            reports = runtestprotocol(item, nextitem=nextitem, log=False)
+            failed = any(report.failed for report in reports)
+            setup_failed = reports[0].when == "setup" and reports[0].failed
+            if not failed or setup_failed or attempt == self.retries or not self._fresh_driver(item):
+                break
+            for report in reports:
+                if report.failed:
+                    report.outcome = "rerun"
+                item.ihook.pytest_runtest_logreport(report=report)
+            item._initrequest()
+        for report in reports:
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        if attempt and not failed:
+            self.current[item.nodeid] = ("flaky", self.current.get(item.nodeid, ("", 0.0))[1])
+        return True
+
+    def pytest_report_teststatus(self, report):
+        if report.outcome == "rerun":
+            return "rerun", "R", ("RERUN", {"yellow": True})
+
+    def pytest_runtest_logreport(self, report):
+        if report.outcome == "rerun":
+            return
+        if report.skipped and not hasattr(report, "wasxfail"):
+            return
+        # Падение теста в карантине xfail превращает в skipped с wasxfail.
+        if report.failed or report.skipped:
+            self.current[report.nodeid] = ("failed", self.current.get(report.nodeid, ("", 0.0))[1])
+        elif report.when == "call":
+            self.current[report.nodeid] = ("passed", report.duration)
+
+    def pytest_sessionfinish(self, session):
+        for nodeid, run in self.current.items():
+            history = (self.history.get(nodeid, []) + [list(run)])[-HISTORY:]
+            self.config.cache.set(self._cache_key(nodeid), history)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        flaky = sorted(nodeid for nodeid, (outcome, _) in self.current.items() if outcome == "flaky")
+        if flaky:
+            terminalreporter.write_sep("-", "прошли только при повторе")
+            for nodeid in flaky:
+                terminalreporter.write_line(nodeid)
+        if self.quarantined:
+            terminalreporter.write_sep("-", "в карантине (xfail)")
+            for nodeid in sorted(self.quarantined):
+                terminalreporter.write_line(nodeid)
+        if not self.config.getoption("--flaky-report"):
+            return
+        terminalreporter.write_sep("-", "нестабильность по истории")
+        terminalreporter.write_line(f"{'прогонов':>8}{'нестаб.':>9}{'среднее, s':>12}{'CV':>7}  тест")
+        for nodeid, history in sorted(self.history.items()):
+            if not history:
+                continue
+            summary = stats(history)
+            terminalreporter.write_line(
+                f"{summary['runs']:>8}{summary['flaky_rate']:>9.0%}{summary['mean']:>12.2f}{summary['cv']:>7.2f}  {nodeid}"
+            )
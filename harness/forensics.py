@@ -0,0 +1,186 @@
+"""Плагин pytest: артефакты упавших тестов.
+
+Пока тесты проходят, копится только кольцевой буфер последних команд
+WebDriver (ссылки на параметры, без сериализации), а консоль страницы
+собирает в свой кольцевой буфер скрипт, внедрённый через CDP. Лишь при
+падении теста в каталог --artifacts-dir/<тест>/ пишутся:
+
+- screenshot.png — снимок экрана (PNG уже сжат);
+- dom.html.gz — DOM страницы;
+- log.json.gz — последние команды и записи консоли;
+- page.har.gz — HAR из Navigation/Resource Timing страницы.
+"""
+import collections
+import datetime
+import gzip
+import json
+import os
+import re
+import time
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from harness.commands import LISTENERS_KEY
+
+COMMAND_BUFFER = 200
+CONSOLE_BUFFER = 200
+
+# Кольцевой буфер консоли и необработанных ошибок; ставится до загрузки страницы.
+_CONSOLE_JS = """
+(() => {
+    if (window.__fbankConsole) return;
+    const buffer = window.__fbankConsole = [];
+    function push(level, args) {
+        buffer.push({time: Date.now(), level, text: args.map(String).join(" ")});
+        if (buffer.length > %d) buffer.shift();
+    }
+    for (const level of ["log", "info", "warn", "error", "debug"]) {
+        const original = console[level];
+        console[level] = function (...args) { push(level, args); return original.apply(this, args); };
+    }
+    addEventListener("error", event => push("uncaught", [event.message]));
+    addEventListener("unhandledrejection", event => push("unhandledrejection", [event.reason]));
+})();
+""" % CONSOLE_BUFFER
+
+_SNAPSHOT_JS = """
+return {
+    console: window.__fbankConsole || [],
+    navigation: performance.getEntriesByType("navigation").map(e => e.toJSON()),
+    resources: performance.getEntriesByType("resource").map(e => e.toJSON()),
+    timeOrigin: performance.timeOrigin,
+};
+"""
+
+
+def pytest_addoption(parser):
+    parser.getgroup("f-bank").addoption(
+        "--artifacts-dir",
+        default="artifacts",
+        metavar="DIR",
+        help="Куда писать артефакты упавших тестов (пустое значение отключает запись).",
+    )
+
+
+def pytest_configure(config):
+    directory = config.getoption("--artifacts-dir")
+    if directory:
+        recorder = FailureRecorder(config, directory)
+        config.pluginmanager.register(recorder, "fbank-forensics")
+        config.stash.setdefault(LISTENERS_KEY, []).append(recorder.record)
+
+
+def _entry(timing, time_origin):
+    """Запись HAR из PerformanceResourceTiming (без заголовков и тел)."""
+    started = datetime.datetime.fromtimestamp((time_origin + timing["startTime"]) / 1000, datetime.timezone.utc)
+    return {
+        "startedDateTime": started.isoformat(),
+        "time": timing["duration"],
+        "request": {"method": "GET", "url": timing["name"], "httpVersion": timing.get("nextHopProtocol", ""),
+                    "headers": [], "queryString": [], "cookies": [], "headersSize": -1, "bodySize": -1},
+        "response": {"status": timing.get("responseStatus", 0), "statusText": "", "httpVersion": "",
+                     "headers": [], "cookies": [], "redirectURL": "", "headersSize": -1,
+                     "bodySize": timing.get("encodedBodySize", -1),
+                     "content": {"size": timing.get("decodedBodySize", -1), "mimeType": ""},
+                     "_transferSize": timing.get("transferSize", -1)},
+        "cache": {},
+        "timings": {
+            "blocked": -1, "dns": timing["domainLookupEnd"] - timing["domainLookupStart"],
+            "connect": timing["connectEnd"] - timing["connectStart"], "ssl": -1,
+            "send": 0, "wait": timing["responseStart"] - timing["requestStart"],
+            "receive": timing["responseEnd"] - timing["responseStart"],
+        },
+    }
+
+
+def build_har(snapshot):
+    entries = snapshot["navigation"] + snapshot["resources"]
+    return {"log": {
+        "version": "1.2",
+        "creator": {"name": "f-bank harness", "version": "1"},
+        "entries": [_entry(timing, snapshot["timeOrigin"]) for timing in entries],
+    }}
+
+
+def _write_gzip(path, text):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(text)
+
+
+class FailureRecorder:
+    def __init__(self, config, directory):
+        self.config = config
+        self.directory = directory
+        self.commands = collections.deque(maxlen=COMMAND_BUFFER)
+        self.test = None
+        self.saved = []
+
+    def record(self, command, params, duration, error):
+        self.commands.append((time.time(), self.test, command, params, duration, error))
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        self.test = item.nodeid
+
+    def pytest_runtest_call(self, item):
+        # Скрипт консоли ставится один раз на драйвер и работает со следующей навигации.
+        for driver in self._drivers():
+            if not getattr(driver, "_fbank_console", False) and hasattr(driver, "execute_cdp_cmd"):
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _CONSOLE_JS})
+                driver._fbank_console = True
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        # До teardown: после него пул уже сбросит браузер на about:blank.
+        if report.failed and call.when in ("setup", "call"):
+            path = self.save(item)
+            if path:
+                report.sections.append(("артефакты", path))
+
+    def _drivers(self):
+        pool = getattr(self.config, "_driver_pool", None)
+        return pool.in_use() if pool is not None else []
+
+    def save(self, item):
+        drivers = self._drivers()
+        if not drivers and not self.commands:
+            return None
+        directory = os.path.join(self.directory, re.sub(r"[^\w.-]+", "_", item.nodeid))
+        os.makedirs(directory, exist_ok=True)
+
+        log = {
+            "test": item.nodeid,
+            "commands": [
+                {"time": at, "test": test, "command": command, "duration_ms": round(duration * 1000, 3),
+                 "error": repr(error) if error else None, "params": params}
+                for at, test, command, params, duration, error in self.commands
+            ],
+            "console": [],
+        }
+        for index, driver in enumerate(drivers):
+            suffix = f"-{index}" if index else ""
+            try:
+                driver.save_screenshot(os.path.join(directory, f"screenshot{suffix}.png"))
+                _write_gzip(os.path.join(directory, f"dom{suffix}.html.gz"), driver.page_source)
+                snapshot = driver.execute_script(_SNAPSHOT_JS)
+            except WebDriverException as e:
+                # Например, открыт alert или браузер упал: пишем, что успели.
+                log["console"].append({"level": "harness", "text": f"снимок не снят: {e.msg}"})
+                continue
+            log["console"] += snapshot["console"]
+            _write_gzip(os.path.join(directory, f"page{suffix}.har.gz"), json.dumps(build_har(snapshot)))
+        _write_gzip(
+            os.path.join(directory, "log.json.gz"),
+            json.dumps(log, ensure_ascii=False, indent=1, default=str),
+        )
+        self.saved.append(directory)
+        return directory
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.saved:
+            terminalreporter.write_sep("-", "артефакты упавших тестов")
+            for directory in self.saved:
+                terminalreporter.write_line(directory)
@@ -0,0 +1,126 @@
+// Выполняет бандл приложения в jsdom без браузера и прогоняет сценарии перевода.
+// Протокол: одна JSON-строка на stdin -> одна JSON-строка на stdout.
+// Первая строка — {"locators": {...}}, дальше — сценарии
+// {"balance", "reserved", "card", "amount", "submit"}.
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const readline = require("readline");
+const { JSDOM } = require("jsdom");
+
+const root = process.argv[2];
+const html = fs.readFileSync(path.join(root, "index.html"), "utf8");
+const bundlePath = html.match(/<script[^>]+src="\/([^"]+\.js)"/)[1];
+const bundle = fs.readFileSync(path.join(root, bundlePath), "utf8");
+
+const dom = new JSDOM(html, {
+    url: "http://localhost/",
+    runScripts: "outside-only",
+    pretendToBeVisual: true,
+});
+const { window } = dom;
+const { document } = window;
+let alerts = [];
+window.alert = message => alerts.push(String(message));
+window.console.log = () => {};  // приложение логирует каждый ввод
+window.eval(bundle);
+
+let locators = null;
+const setValue = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, "value").set;
+
+// Локатор: [by, selector, запасной by, запасной selector], как FIND_JS в harness/locators.py.
+function query(by, selector) {
+    if (by === "xpath") {
+        return document.evaluate(selector, document, null,
+            window.XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    try {
+        return document.querySelector(selector);
+    } catch (e) {
+        return null;  // jsdom поддерживает не все селекторы (например, :has)
+    }
+}
+function find(locator) {
+    let found = null;
+    for (let i = 0; i < locator.length && !found; i += 2) {
+        found = query(locator[i], locator[i + 1]);
+    }
+    return found;
+}
+function text(locator) {
+    const el = find(locator);
+    return el ? el.textContent.replace(/\s+/g, " ").trim() : null;
+}
+// Обновления React планируются через планировщик, даём ему несколько задач.
+async function settle() {
+    for (let i = 0; i < 5; i++) {
+        await new Promise(resolve => window.setTimeout(resolve, 0));
+    }
+}
+// balance и reserved читаются из location.search: уход на пустой маршрут
+// размонтирует форму, возврат на "/" монтирует её заново с чистым состоянием.
+async function navigate(url) {
+    window.history.pushState({}, "", url);
+    window.dispatchEvent(new window.PopStateEvent("popstate", {state: {}}));
+    await settle();
+}
+async function type(el, value) {
+    el.focus();
+    setValue.call(el, value);
+    el.dispatchEvent(new window.Event("input", {bubbles: true}));
+    await settle();
+}
+
+async function run(scenario) {
+    alerts = [];
+    await navigate("/__reset");
+    await navigate(`/?balance=${scenario.balance}&reserved=${scenario.reserved}`);
+    const card = find(locators.account);
+    if (!card) throw new Error("Карточка 'Рубли' не отрисовалась");
+    card.dispatchEvent(new window.MouseEvent("click", {bubbles: true}));
+    await settle();
+
+    const cardInput = find(locators.card);
+    if (scenario.card !== null) await type(cardInput, scenario.card);
+    let amountInput = find(locators.amount);
+    if (scenario.amount !== null && amountInput) await type(amountInput, scenario.amount);
+    amountInput = find(locators.amount);
+    const button = find(locators.button);
+    if (scenario.submit && button) {
+        button.dispatchEvent(new window.MouseEvent("click", {bubbles: true}));
+        await settle();
+    }
+    return {
+        state: {
+            card_value: cardInput.value,
+            amount_present: amountInput !== null,
+            amount_value: amountInput ? amountInput.value : null,
+            commission_text: text(locators.commission),
+            error_text: text(locators.error),
+            button_present: button !== null,
+            button_enabled: button !== null && !button.disabled,
+        },
+        alerts,
+    };
+}
+
+const input = readline.createInterface({input: process.stdin});
+let queue = Promise.resolve();
+input.on("line", line => {
+    queue = queue.then(async () => {
+        const message = JSON.parse(line);
+        let reply;
+        try {
+            if (message.locators) {
+                locators = message.locators;
+                reply = {ready: true};
+            } else {
+                reply = await run(message);
+            }
+        } catch (error) {
+            reply = {failure: String(error && error.stack || error)};
+        }
+        process.stdout.write(JSON.stringify(reply) + "\n");
+    });
+});
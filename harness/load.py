@@ -0,0 +1,241 @@
+"""Режим нагрузки: много одновременных пользователей проходят сценарий перевода.
+
+Пользователь — поток, который до конца прогона повторяет путь:
+
+- browser: start_transfer -> номер карты -> сумма -> «Перевести» в своём
+  Chrome из DriverPool (настоящий клиент, но тяжёлый: один браузер на
+  пользователя);
+- http: то, что этот путь делает с сервером, на уровне протокола:
+  index.html и все ассеты со страницы по keep-alive соединению, как
+  новый посетитель без кеша. Перевод в приложении обрабатывается на
+  клиенте, поэтому других запросов к серверу в пути нет.
+
+Пользователи подключаются по профилю разгона (constant, linear, step).
+В отчёте — пропускная способность, p50/p95/p99 по шагам, ошибки
+клиента (включая запуск браузера) и коды ответов локального сервера.
+После ошибки пользователь делает паузу, а после MAX_FAILURES неудачных
+путей подряд выбывает из прогона:
+
+    python -m harness.load --mode http --users 50 --duration 30 --profile linear --ramp-up 10
+"""
+import argparse
+import collections
+import http.client
+import re
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from harness.drivers import DriverPool
+from harness.pages import TransferPage
+from harness.server import StaticServer
+
+CARD = "1111222233334444"
+# Пользователь, у которого подряд столько путей закончились ошибкой, выбывает.
+MAX_FAILURES = 5
+BACKOFF = 0.1
+BACKOFF_LIMIT = 2.0
+_ASSET_RE = re.compile(r'(?:src|href)="(/assets/[^"]+)"')
+
+
+def start_delays(profile, users, ramp_up, step_size=1):
+    """Задержка старта каждого пользователя, с."""
+    if profile == "constant" or users <= 1 or ramp_up <= 0:
+        return [0.0] * users
+    if profile == "linear":
+        return [ramp_up * index / (users - 1) for index in range(users)]
+    if profile == "step":
+        steps = max(1, -(-users // step_size) - 1)
+        return [ramp_up * (index // step_size) / steps for index in range(users)]
+    raise ValueError(f"неизвестный профиль разгона: {profile}")
+
+
+class Results:
+    """Латентности по шагам и ошибки, общие для всех потоков."""
+
+    def __init__(self):
+        self.latencies = collections.defaultdict(list)
+        self.errors = collections.Counter()
+        self.journeys = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def step(self, name, action):
+        started = time.perf_counter()
+        try:
+            result = action()
+        except Exception as e:
+            with self._lock:
+                self.errors[f"{name}: {type(e).__name__}"] += 1
+            raise
+        with self._lock:
+            self.latencies[name].append(time.perf_counter() - started)
+        return result
+
+    def journey_done(self):
+        with self._lock:
+            self.journeys += 1
+
+    def user_dropped(self):
+        with self._lock:
+            self.dropped += 1
+
+
+def percentiles(values):
+    if len(values) < 2:
+        value = values[0] if values else 0.0
+        return value, value, value
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+# --- Пути пользователя ---
+class BrowserUser:
+    def __init__(self, pool, base_url):
+        self.pool = pool
+        self.base_url = base_url
+        self.driver = None
+
+    def journey(self, results):
+        if self.driver is None:
+            self.driver = results.step("browser", self.pool.acquire)
+        page = TransferPage(self.driver)
+        results.step("start_transfer", lambda: page.open(self.base_url, balance=100000, reserved=0))
+        results.step("card", lambda: page.fill(card=CARD))
+        results.step("amount", lambda: page.fill(amount="100"))
+
+        def submit():
+            alert = page.submit()
+            alert.accept()
+
+        results.step("submit", submit)
+
+    def close(self):
+        if self.driver is not None:
+            self.pool.release(self.driver)
+
+
+class HttpUser:
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port
+        self.connection = None
+
+    def _get(self, path):
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.host, self.port, timeout=10)
+        try:
+            self.connection.request("GET", path, headers={"Accept-Encoding": "br, gzip"})
+            response = self.connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = None
+            raise
+        if response.status >= 400:
+            raise http.client.HTTPException(f"HTTP {response.status} для {path}")
+        return body
+
+    def journey(self, results):
+        html = results.step("index", lambda: self._get("/?balance=100000&reserved=0"))
+        for path in _ASSET_RE.findall(html.decode("utf-8")):
+            results.step("assets", lambda: self._get(path))
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+
+def run(make_user, users, duration, delays, results):
+    """Запускает пользователей по задержкам и ждёт конца прогона."""
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+
+    def worker(delay):
+        time.sleep(delay)
+        user = make_user()
+        failures = 0
+        try:
+            while time.perf_counter() < deadline:
+                try:
+                    user.journey(results)
+                except Exception:
+                    # Ошибка уже посчитана в Results.step; пауза растёт с каждым
+                    # неудачным путём подряд, чтобы не крутиться вхолостую.
+                    failures += 1
+                    if failures >= MAX_FAILURES:
+                        results.user_dropped()
+                        break
+                    pause = min(BACKOFF * 2 ** (failures - 1), BACKOFF_LIMIT)
+                    time.sleep(max(0.0, min(pause, deadline - time.perf_counter())))
+                    continue
+                failures = 0
+                results.journey_done()
+        finally:
+            user.close()
+
+    threads = [threading.Thread(target=worker, args=(delay,), daemon=True) for delay in delays[:users]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def report(results, elapsed, statuses):
+    print(f"\nпутей пройдено: {results.journeys} за {elapsed:.1f} s, "
+          f"{results.journeys / elapsed:.2f} путей/с")
+    if results.dropped:
+        print(f"выбыло пользователей после {MAX_FAILURES} ошибок подряд: {results.dropped}")
+    print(f"\n{'шаг':<16}{'число':>8}{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}")
+    for name, values in results.latencies.items():
+        p50, p95, p99 = percentiles(values)
+        print(f"{name:<16}{len(values):>8}{p50 * 1000:>10.1f}{p95 * 1000:>10.1f}{p99 * 1000:>10.1f}")
+    attempts = sum(len(values) for values in results.latencies.values()) + sum(results.errors.values())
+    print(f"\nошибки клиента: {sum(results.errors.values())} из {attempts}")
+    for error, count in results.errors.most_common():
+        print(f"  {count:>6}  {error}")
+    if statuses is not None:
+        total = sum(statuses.values())
+        failed = sum(count for status, count in statuses.items() if status >= 400)
+        codes = ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items()))
+        rate = failed / total if total else 0.0
+        print(f"ответы сервера: {total} ({codes}), ошибок {rate:.2%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("http", "browser"), default="http")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30, help="длительность прогона, с")
+    parser.add_argument("--profile", choices=("constant", "linear", "step"), default="linear")
+    parser.add_argument("--ramp-up", type=float, default=5, help="время разгона, с")
+    parser.add_argument("--step-size", type=int, default=5, help="пользователей на ступень (step)")
+    parser.add_argument("--base-url", help="адрес уже запущенного приложения; по умолчанию свой сервер")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = StaticServer().start()
+        base_url = server.url
+
+    pool = DriverPool() if args.mode == "browser" else None
+    results = Results()
+    delays = start_delays(args.profile, args.users, args.ramp_up, args.step_size)
+    try:
+        if pool is not None:
+            elapsed = run(lambda: BrowserUser(pool, base_url), args.users, args.duration, delays, results)
+        else:
+            elapsed = run(lambda: HttpUser(base_url), args.users, args.duration, delays, results)
+    finally:
+        if pool is not None:
+            pool.close()
+        if server is not None:
+            server.stop()
+    report(results, elapsed, server.statuses if server is not None else None)
+
+
+if __name__ == "__main__":
+    main()
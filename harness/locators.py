@@ -0,0 +1,125 @@
+"""Локаторы приложения и общий резолвер для скриптов в странице.
+
+Основной вариант локатора — CSS (по id и атрибутам из бандла), XPath
+оставлен запасным: резолвер пробует его, только если CSS ничего не нашёл
+или браузер не поддерживает селектор. Locator остаётся кортежем (by, value),
+поэтому его можно передавать в find_element и expected_conditions.
+"""
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+
+class Locator(tuple):
+    """Пара (by, value) с необязательным запасным локатором."""
+
+    def __new__(cls, by, value, fallback=None):
+        locator = super().__new__(cls, (by, value))
+        locator.fallback = fallback
+        return locator
+
+
+class Locators:
+    RUBLE_ACCOUNT_CARD = Locator(
+        By.CSS_SELECTOR, "div:has(> p > #rub-sum) > h2",
+        fallback=(By.XPATH, "//h2[normalize-space()='Рубли']"),
+    )
+    F_BANK_LOGO = Locator(
+        By.CSS_SELECTOR, "#root h1",
+        fallback=(By.XPATH, "//h1[contains(text(), 'F-Bank')]"),
+    )
+    RUBLE_BALANCE = Locator(
+        By.CSS_SELECTOR, "p:has(> #rub-sum)",
+        fallback=(By.XPATH, "//h2[normalize-space()='Рубли']/following-sibling::p[contains(text(), 'На счету:')]"),
+    )
+
+    CARD_NUMBER_INPUT = Locator(By.CSS_SELECTOR, "input[placeholder='0000 0000 0000 0000']")
+    TRANSFER_AMOUNT_INPUT = Locator(
+        By.CSS_SELECTOR, "input[placeholder='1000']",
+        fallback=(By.XPATH, "//h3[contains(text(), 'Сумма перевода')]/following-sibling::input"),
+    )
+    TRANSFER_BUTTON = Locator(
+        By.CSS_SELECTOR, "h3 ~ button",
+        fallback=(By.XPATH, "//button[normalize-space()='Перевести']"),
+    )
+    COMMISSION_VALUE = Locator(
+        By.CSS_SELECTOR, "p:has(> #comission)",
+        fallback=(By.XPATH, "//p[contains(text(), 'Комиссия:')]"),
+    )
+
+    # Сообщение отличается от остальных только текстом, для него нет CSS.
+    ERROR_MESSAGE = Locator(By.XPATH, "//*[contains(text(), 'Недостаточно средств на счете')]")
+    AMOUNT_VALIDATION_ERROR = Locator(
+        By.CSS_SELECTOR, "input[type='number'][name='amount'] ~ p.error-message",
+        fallback=(By.XPATH, "//input[@type='number' and @name='amount']/following-sibling::p[contains(@class, 'error-message')]"),
+    )
+
+
+def all_locators():
+    return {name: value for name, value in vars(Locators).items() if isinstance(value, Locator)}
+
+
+_JS_BY = {By.XPATH: "xpath", By.CSS_SELECTOR: "css"}
+
+
+def _js_pair(by, value):
+    if by == By.ID:
+        return ["css", f"#{value}"]
+    return [_JS_BY[by], value]
+
+
+def js_locator(locator):
+    """Локатор для FIND_JS: [by, selector, запасной by, запасной selector]."""
+    pairs = _js_pair(*locator)
+    fallback = getattr(locator, "fallback", None)
+    if fallback:
+        pairs += _js_pair(*fallback)
+    return pairs
+
+
+def find_element(driver, locator):
+    """find_element с переходом на запасной локатор."""
+    try:
+        return driver.find_element(*locator)
+    except NoSuchElementException:
+        fallback = getattr(locator, "fallback", None)
+        if fallback is None:
+            raise
+        return driver.find_element(*fallback)
+
+
+# Резолвер для скриптов в странице. Найденные элементы (и их отсутствие)
+# кешируются до первого изменения DOM: кеш сбрасывает MutationObserver,
+# который создаётся раньше наблюдателей ожиданий и срабатывает первым.
+FIND_JS = """
+function query(by, selector) {
+    if (by === "xpath") {
+        return document.evaluate(selector, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    try {
+        return document.querySelector(selector);
+    } catch (e) {
+        return null;  // селектор не поддерживается, пробуем запасной
+    }
+}
+function locatorCache() {
+    if (!window.__fbankLocatorCache) {
+        const cache = new Map();
+        new MutationObserver(() => cache.clear()).observe(document,
+            {childList: true, subtree: true, attributes: true, characterData: true});
+        window.__fbankLocatorCache = cache;
+    }
+    return window.__fbankLocatorCache;
+}
+function find(locator) {
+    const cache = locatorCache();
+    const key = locator.join("\\u0000");
+    if (cache.has(key)) return cache.get(key);
+    let found = null;
+    for (let i = 0; i < locator.length && !found; i += 2) {
+        found = query(locator[i], locator[i + 1]);
+    }
+    cache.set(key, found);
+    return found;
+}
+"""
@@ -0,0 +1,62 @@
+"""Быстрый уровень тестов без браузера: бандл выполняется в jsdom под node.
+
+Один процесс node живёт всю сессию; между сценариями приложение
+перемонтируется через history API, поэтому бандл разбирается один раз,
+а сценарий занимает миллисекунды. Нужны node и пакет jsdom (npm install).
+"""
+import json
+import os
+import shutil
+import subprocess
+
+from harness.pages import FORM_JS_LOCATORS, TransferState
+from harness.server import ROOT
+
+RUNNER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js", "logic_runner.js")
+
+
+def unavailable_reason(root=ROOT):
+    """Причина, по которой уровень недоступен, или None."""
+    node = shutil.which("node")
+    if node is None:
+        return "node не найден"
+    check = subprocess.run(
+        [node, "-e", "require.resolve('jsdom')"], cwd=root, capture_output=True
+    )
+    if check.returncode != 0:
+        return "пакет jsdom не установлен (npm install)"
+    return None
+
+
+class LogicRuntime:
+    """Процесс node с загруженным приложением, принимающий сценарии перевода."""
+
+    def __init__(self, root=ROOT):
+        self._process = subprocess.Popen(
+            [shutil.which("node"), RUNNER, root],
+            cwd=root,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self._call({"locators": FORM_JS_LOCATORS})
+
+    def _call(self, message):
+        self._process.stdin.write(json.dumps(message, ensure_ascii=False) + "\n")
+        reply = json.loads(self._process.stdout.readline())
+        if "failure" in reply:
+            raise RuntimeError(reply["failure"])
+        return reply
+
+    def run(self, balance, reserved, card, amount, submit=False):
+        """Один сценарий: (TransferState, тексты alert)."""
+        reply = self._call(
+            {"balance": balance, "reserved": reserved, "card": card, "amount": amount, "submit": submit}
+        )
+        return TransferState(**reply["state"]), reply["alerts"]
+
+    def close(self):
+        self._process.stdin.close()
+        self._process.wait()
@@ -0,0 +1,32 @@
+"""Эталонная модель правил формы перевода, повторяющая логику бандла.
+
+В бандле: сумма из поля очищается от всего, кроме цифр (ведущий минус
+сохраняется), комиссия равна Math.floor(O/100)*10, а перевод доступен при
+balance - reserved - commission - amount > 0. Арифметика во float, в том
+же порядке, что и в JS, чтобы совпадали граничные случаи с дробями.
+"""
+import math
+
+
+def parse_amount(text):
+    """Значение суммы после обработчика onChange поля «Сумма перевода»."""
+    negative = text.startswith("-")
+    digits = "".join(char for char in text if char.isdigit())
+    if negative:
+        digits = "-" + digits
+    if digits in ("", "-"):
+        return 0
+    return int(digits)
+
+
+def parse_param(value):
+    """Number(params.get(...) || "0") для balance и reserved."""
+    return float(value) if value not in ("", None) else 0.0
+
+
+def commission(amount):
+    return math.floor(amount / 100) * 10
+
+
+def is_sufficient(balance, reserved, amount):
+    return balance - reserved - commission(amount) - amount > 0
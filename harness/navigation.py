@@ -0,0 +1,121 @@
+"""Плагин pytest: время открытия формы перевода на кейс.
+
+Каждое открытие формы (TransferPage.open, open_prefilled, reopen и
+загрузка страницы в ScenarioRunner) записывается со способом: load —
+driver.get и клик по карточке, deeplink — --fast-setup, remount —
+перемонтирование уже загруженного приложения (--single-page и сценарии).
+Итоги по режиму запуска сохраняются в кеше pytest (ключ fbank/navigation).
+Воркеры --workers одного прогона (общий FBANK_RUN_ID) складывают свои
+счётчики в одну запись под файловой блокировкой; новый прогон в том же
+режиме запись заменяет. С опцией --navigation-report (или в режиме --single-page) печатается
+сравнение с последним прогоном в других режимах.
+"""
+import collections
+import os
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # без fcntl (Windows) параллельная запись не защищена
+    fcntl = None
+
+from harness.pages import TransferPage
+from harness.parallel import RUN_ID_ENV
+
+CACHE_KEY = "fbank/navigation"
+
+
+def pytest_addoption(parser):
+    parser.getgroup("f-bank").addoption(
+        "--navigation-report",
+        action="store_true",
+        default=False,
+        help="Показать время открытия формы на кейс в сравнении с другими режимами.",
+    )
+
+
+def pytest_configure(config):
+    timer = NavigationTimer(config)
+    TransferPage.open_listeners.append(timer.record)
+    config.pluginmanager.register(timer, "fbank-navigation")
+
+
+def run_mode(config):
+    if config.getoption("--single-page"):
+        return "single-page"
+    if config.getoption("--fast-setup"):
+        return "fast-setup"
+    return "обычный"
+
+
+def merge(entry, run_id, kinds):
+    """Запись режима в кеше с добавленными счётчиками этого процесса."""
+    if not entry or entry.get("run_id") != run_id:
+        return {"run_id": run_id, "kinds": {how: list(value) for how, value in kinds.items()}}
+    merged = {how: list(value) for how, value in entry["kinds"].items()}
+    for how, (number, seconds) in kinds.items():
+        total = merged.setdefault(how, [0, 0.0])
+        total[0] += number
+        total[1] += seconds
+    return {"run_id": run_id, "kinds": merged}
+
+
+def summarize(kinds):
+    """{способ: [число, сумма секунд]} -> (открытий, среднее мс)."""
+    count = sum(number for number, _ in kinds.values())
+    total = sum(seconds for _, seconds in kinds.values())
+    return count, total / count * 1000 if count else 0.0
+
+
+class NavigationTimer:
+    def __init__(self, config):
+        self.config = config
+        self.mode = run_mode(config)
+        self.run_id = os.environ.setdefault(RUN_ID_ENV, uuid.uuid4().hex)
+        self.kinds = collections.defaultdict(lambda: [0, 0.0])
+
+    def record(self, how, seconds):
+        self.kinds[how][0] += 1
+        self.kinds[how][1] += seconds
+
+    def pytest_unconfigure(self, config):
+        if self.record in TransferPage.open_listeners:
+            TransferPage.open_listeners.remove(self.record)
+
+    def _save(self):
+        """Добавляет счётчики в кеш и возвращает записи, какими они были до этого."""
+        with open(self.config.cache.mkdir("fbank") / "navigation.lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)  # закрытие файла снимает блокировку
+            previous = self.config.cache.get(CACHE_KEY, {})
+            entry = merge(previous.get(self.mode), self.run_id, self.kinds)
+            self.config.cache.set(CACHE_KEY, {**previous, self.mode: entry})
+        return previous
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.kinds:
+            return
+        previous = {}
+        if getattr(self.config, "cache", None) is not None:
+            previous = self._save()
+        if not (self.config.getoption("--navigation-report") or self.config.getoption("--single-page")):
+            return
+
+        terminalreporter.write_sep("-", "открытие формы на кейс")
+        count, mean = summarize(self.kinds)
+        details = ", ".join(
+            f"{how}: {number} × {seconds / number * 1000:.1f} ms" for how, (number, seconds) in sorted(self.kinds.items())
+        )
+        terminalreporter.write_line(f"{self.mode:<12} {count:>5} открытий, среднее {mean:8.1f} ms  ({details})")
+        for mode, entry in sorted(previous.items()):
+            if mode == self.mode:
+                continue
+            # Записи до появления run_id хранили счётчики без обёртки.
+            kinds = entry.get("kinds", entry)
+            other_count, other_mean = summarize(kinds)
+            if not other_count:
+                continue
+            ratio = f", {other_mean / mean:.1f}× от текущего" if mean else ""
+            terminalreporter.write_line(
+                f"{mode:<12} {other_count:>5} открытий, среднее {other_mean:8.1f} ms  (прошлый прогон{ratio})"
+            )
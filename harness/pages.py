@@ -0,0 +1,363 @@
+"""Page object формы перевода: ввод и чтение состояния за один вызов WebDriver."""
+import itertools
+import json
+import re
+import time
+from typing import NamedTuple, Optional
+
+from urllib.parse import urlencode, urlsplit
+
+import pytest
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+from harness.locators import FIND_JS, Locators, find_element, js_locator
+from harness.waits import set_script_timeout, wait_alert, wait_clickable
+
+# Таймаут ожидания элементов внутри скрипта, мс.
+_FIELD_TIMEOUT_MS = 5000
+
+# Общие функции для скриптов ниже; аргументы скрипта разбирает каждый скрипт сам.
+_HELPERS_JS = FIND_JS + """
+function waitFor(locator, timeoutMs) {
+    const found = find(locator);
+    if (found) return Promise.resolve(found);
+    return new Promise(resolve => {
+        const observer = new MutationObserver(() => {
+            const el = find(locator);
+            if (el) { observer.disconnect(); clearTimeout(timer); resolve(el); }
+        });
+        const timer = setTimeout(() => { observer.disconnect(); resolve(null); }, timeoutMs);
+        observer.observe(document.documentElement, {childList: true, subtree: true});
+    });
+}
+// Обновления React применяются после текущей задачи; планировщик React
+// ставит задачи через MessageChannel, поэтому наша задача идёт за ними.
+function nextTask() {
+    return new Promise(resolve => {
+        const channel = new MessageChannel();
+        channel.port1.onmessage = () => resolve();
+        channel.port2.postMessage(null);
+    });
+}
+// React отслеживает value через свой трекер, поэтому значение ставится
+// нативным сеттером, а затем отправляется событие input, как при вводе.
+const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+function type(el, value) {
+    el.focus();
+    setValue.call(el, value);
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+    return nextTask();
+}
+function text(locator) {
+    const el = find(locator);
+    return el ? el.innerText : null;
+}
+function collect(L, cardInput) {
+    const amountInput = find(L.amount);
+    const button = find(L.button);
+    return {
+        card_value: cardInput.value,
+        amount_present: amountInput !== null,
+        amount_value: amountInput ? amountInput.value : null,
+        commission_text: text(L.commission),
+        error_text: text(L.error),
+        button_present: button !== null,
+        button_enabled: button !== null && !button.disabled,
+    };
+}
+"""
+
+_FILL_JS = _HELPERS_JS + """
+const [L, card, amount, timeoutMs, done] = arguments;
+(async () => {
+    const cardInput = await waitFor(L.card, timeoutMs);
+    if (!cardInput) throw new Error("Поле номера карты не найдено");
+    if (card !== null) await type(cardInput, card);
+    const amountInput = find(L.amount);
+    if (amount !== null && amountInput) await type(amountInput, amount);
+    done(collect(L, cardInput));
+})().catch(error => done({failure: String(error)}));
+"""
+
+# balance и reserved приложение берёт из location.search через роутер:
+# replaceState + popstate меняет их без перезагрузки, состояние формы сохраняется.
+_PROBE_JS = _HELPERS_JS + """
+const [L, search, amount, done] = arguments;
+(async () => {
+    history.replaceState(history.state, "", search);
+    dispatchEvent(new PopStateEvent("popstate", {state: history.state}));
+    await nextTask();
+    await nextTask();
+    const cardInput = find(L.card);
+    const amountInput = find(L.amount);
+    if (!amountInput) throw new Error("Поле суммы не найдено: форма не заполнена");
+    await type(amountInput, amount);
+    done(collect(L, cardInput));
+})().catch(error => done({failure: String(error)}));
+"""
+
+# Перемонтирование без перезагрузки: маршрута /__reset в приложении нет,
+# роутер снимает форму со всем её состоянием, а возврат на / монтирует её
+# заново с новыми balance и reserved. Бандл не загружается повторно.
+# Если задан origin, а страница не с приложением этого адреса, скрипт
+# возвращает null: вызывающий загружает приложение обычным переходом.
+_REOPEN_JS = _HELPERS_JS + """
+const [L, search, card, amount, timeoutMs, origin, done] = arguments;
+if (origin !== null && (location.origin !== origin || !document.getElementById("root"))) {
+    done(null);
+    return;
+}
+function navigate(url) {
+    history.replaceState(null, "", url);
+    dispatchEvent(new PopStateEvent("popstate", {state: null}));
+    return nextTask();
+}
+(async () => {
+    await navigate("/__reset");
+    await navigate("/" + search);
+    const account = await waitFor(L.account, timeoutMs);
+    if (!account) throw new Error("Карточка 'Рубли' не найдена");
+    account.click();
+    const cardInput = await waitFor(L.card, timeoutMs);
+    if (!cardInput) throw new Error("Поле номера карты не найдено");
+    if (card !== null) await type(cardInput, card);
+    const amountInput = find(L.amount);
+    if (amount !== null && amountInput) await type(amountInput, amount);
+    done(collect(L, cardInput));
+})().catch(error => done({failure: String(error)}));
+"""
+
+# Элементы формы перевода по именам, которыми их находят скрипты страницы
+# (здесь и в harness.logic).
+_FORM_LOCATORS = {
+    "account": Locators.RUBLE_ACCOUNT_CARD,
+    "card": Locators.CARD_NUMBER_INPUT,
+    "amount": Locators.TRANSFER_AMOUNT_INPUT,
+    "commission": Locators.COMMISSION_VALUE,
+    "error": Locators.ERROR_MESSAGE,
+    "button": Locators.TRANSFER_BUTTON,
+}
+FORM_JS_LOCATORS = {name: js_locator(locator) for name, locator in _FORM_LOCATORS.items()}
+
+# Быстрая подготовка (deep link): приложение само не умеет открывать форму
+# по ссылке, поэтому скрипт, внедрённый до загрузки страницы, читает
+# параметры из хеша (#fbank-open=rub&fbank-card=...&fbank-amount=...),
+# выбирает счет и заполняет поля, а по готовности ставит data-fbank-ready.
+# Хеш не участвует в маршрутизации, поэтому приложение его не замечает.
+_DEEPLINK_JS = "(() => {" + _HELPERS_JS + """
+if (window.__fbankDeepLink) return;
+window.__fbankDeepLink = true;
+const params = new URLSearchParams(location.hash.slice(1));
+if (!params.has("fbank-open")) return;
+const L = %s;
+const timeoutMs = %d;
+function ready(value) { document.documentElement.dataset.fbankReady = value; }
+(async () => {
+    const account = await waitFor(L.account, timeoutMs);
+    if (!account) throw new Error("Карточка 'Рубли' не найдена");
+    account.click();
+    const cardInput = await waitFor(L.card, timeoutMs);
+    if (!cardInput) throw new Error("Поле номера карты не найдено");
+    if (params.has("fbank-card")) await type(cardInput, params.get("fbank-card"));
+    if (params.has("fbank-amount")) {
+        const amountInput = find(L.amount);
+        if (amountInput) await type(amountInput, params.get("fbank-amount"));
+    }
+    ready("ok");
+})().catch(error => ready("error: " + error));
+})();
+""" % (json.dumps(FORM_JS_LOCATORS, ensure_ascii=False), _FIELD_TIMEOUT_MS)
+
+# Ждёт отметку data-fbank-ready от скрипта deep link и снимает состояние формы.
+_READY_JS = _HELPERS_JS + """
+const [L, timeoutMs, done] = arguments;
+const root = document.documentElement;
+function finish() {
+    const status = root.dataset.fbankReady;
+    if (status !== "ok") { done({failure: status || "форма не подготовлена"}); return; }
+    done(collect(L, find(L.card)));
+}
+if (root.dataset.fbankReady) { finish(); return; }
+const observer = new MutationObserver(() => {
+    if (root.dataset.fbankReady) { observer.disconnect(); clearTimeout(timer); finish(); }
+});
+const timer = setTimeout(() => { observer.disconnect(); finish(); }, timeoutMs);
+observer.observe(root, {attributes: true, attributeFilter: ["data-fbank-ready"]});
+"""
+
+
+# Меняющийся параметр запроса: переход, отличающийся только хешем, не
+# перезагружает страницу, и внедрённый скрипт бы не сработал.
+_navigation_ids = itertools.count()
+
+
+def deeplink_url(base_url, balance, reserved, card=None, amount=None):
+    """Адрес, по которому внедрённый скрипт сам откроет и заполнит форму."""
+    fragment = {"fbank-open": "rub"}
+    if card is not None:
+        fragment["fbank-card"] = card
+    if amount is not None:
+        fragment["fbank-amount"] = amount
+    query = f"balance={balance}&reserved={reserved}&fbank-nav={next(_navigation_ids)}"
+    return f"{base_url}/?{query}#{urlencode(fragment)}"
+
+
+class TransferState(NamedTuple):
+    """Состояние формы перевода после ввода."""
+
+    card_value: str
+    amount_present: bool
+    amount_value: Optional[str]
+    commission_text: Optional[str]
+    error_text: Optional[str]
+    button_present: bool
+    button_enabled: bool
+
+    @property
+    def commission(self):
+        """Комиссия числом или None, если она не отображается."""
+        if self.commission_text is None:
+            return None
+        return int(re.search(r"-?\d+", self.commission_text.split(":")[1]).group())
+
+    @property
+    def insufficient_funds(self):
+        return self.error_text is not None and "Недостаточно средств" in self.error_text
+
+
+class TransferPage:
+    """Форма перевода на карту после выбора рублевого счета.
+
+    При fast_setup (опция --fast-setup) форма открывается и заполняется по
+    deep link: одна навигация и один вызов скрипта вместо цепочки ожиданий.
+    При single_page (опция --single-page) уже загруженное приложение не
+    загружается заново, а перемонтируется с новыми balance и reserved.
+    """
+
+    fast_setup = False
+    single_page = False
+    # Слушатели открытий формы: listener(способ, секунды), где способ —
+    # load, deeplink или remount.
+    open_listeners = []
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def open(self, base_url, balance=30000, reserved=20001):
+        """Открывает приложение и выбирает рублевый счет (как start_transfer)."""
+        if self.fast_setup or self.single_page:
+            self.open_prefilled(base_url, balance, reserved)
+            return self
+        return self._load(base_url, balance, reserved)
+
+    def open_prefilled(self, base_url, balance=30000, reserved=20001, card=None, amount=None):
+        """Открывает форму сразу с номером карты и суммой и возвращает TransferState."""
+        started = time.perf_counter()
+        if self.single_page:
+            state = self._remount(base_url, balance, reserved, card, amount)
+            if state is not None:
+                self._opened("remount", started)
+                return state
+        if not self.fast_setup:
+            return self._load(base_url, balance, reserved).fill(card, amount)
+        native = self._install_deeplink()
+        self.driver.get(deeplink_url(base_url, balance, reserved, card, amount))
+        if not native:
+            self.driver.execute_script(_DEEPLINK_JS)
+        try:
+            state = self._execute(_READY_JS, _FIELD_TIMEOUT_MS)
+        except JavascriptException as e:
+            raise TimeoutException(f"Форма не подготовилась по deep link: {e.msg}") from None
+        self._opened("deeplink", started)
+        return state
+
+    def load(self, base_url):
+        """Загружает приложение без открытия формы."""
+        started = time.perf_counter()
+        self.driver.get(f"{base_url}/")
+        self._opened("load", started)
+        return self
+
+    def _load(self, base_url, balance, reserved):
+        started = time.perf_counter()
+        self.driver.get(f"{base_url}/?balance={balance}&reserved={reserved}")
+        try:
+            wait_clickable(self.driver, Locators.RUBLE_ACCOUNT_CARD, timeout=15).click()
+        except TimeoutException:
+            raise TimeoutException("Не удалось найти карточку 'Рубли' на странице") from None
+        self._opened("load", started)
+        return self
+
+    def _remount(self, base_url, balance, reserved, card, amount):
+        """Перемонтирует загруженное приложение; None, если на странице его нет."""
+        parts = urlsplit(base_url)
+        try:
+            return self._execute(
+                _REOPEN_JS, f"?balance={balance}&reserved={reserved}", card, amount, _FIELD_TIMEOUT_MS,
+                f"{parts.scheme}://{parts.netloc}",
+            )
+        except JavascriptException as e:
+            raise TimeoutException(f"Форма не открылась после перемонтирования: {e.msg}") from None
+
+    def _opened(self, how, started):
+        elapsed = time.perf_counter() - started
+        for listener in self.open_listeners:
+            listener(how, elapsed)
+
+    def _install_deeplink(self):
+        """Внедряет скрипт deep link до загрузки страниц; False, если браузер не умеет."""
+        if getattr(self.driver, "_fbank_deeplink", False):
+            return True
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            return False
+        self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _DEEPLINK_JS})
+        self.driver._fbank_deeplink = True
+        return True
+
+    def _execute(self, script, *args):
+        set_script_timeout(self.driver, _FIELD_TIMEOUT_MS / 1000 + 5)
+        result = self.driver.execute_async_script(script, FORM_JS_LOCATORS, *args)
+        if result is None:
+            return None
+        if "failure" in result:
+            raise JavascriptException(result["failure"])
+        return TransferState(**result)
+
+    def fill(self, card=None, amount=None):
+        """Вводит номер карты и сумму и возвращает TransferState одним запросом.
+
+        None означает, что поле не трогается.
+        """
+        return self._execute(_FILL_JS, card, amount, _FIELD_TIMEOUT_MS)
+
+    def probe(self, balance, reserved, amount):
+        """Меняет balance/reserved без перезагрузки, вводит сумму и снимает состояние.
+
+        Форма уже должна быть открыта с введённым номером карты.
+        """
+        return self._execute(_PROBE_JS, f"?balance={balance}&reserved={reserved}", amount)
+
+    def reopen(self, balance=30000, reserved=20001, card=None, amount=None):
+        """Заново монтирует приложение на уже загруженной странице и заполняет форму.
+
+        Быстрее open_prefilled: без навигации браузера и загрузки бандла.
+        """
+        started = time.perf_counter()
+        search = f"?balance={balance}&reserved={reserved}"
+        state = self._execute(_REOPEN_JS, search, card, amount, _FIELD_TIMEOUT_MS, None)
+        self._opened("remount", started)
+        return state
+
+    def submit(self):
+        """Нажимает «Перевести» и возвращает появившийся alert."""
+        find_element(self.driver, Locators.TRANSFER_BUTTON).click()
+        return wait_alert(self.driver)
+
+
+# --- Вспомогательная функция для начала перевода ---
+def start_transfer(driver, base_url, balance=30000, reserved=20001):
+    try:
+        return TransferPage(driver).open(base_url, balance, reserved)
+    except TimeoutException:
+        # Снимок экрана и DOM сохраняет плагин harness.forensics.
+        pytest.fail("Не удалось найти карточку 'Рубли' для начала теста. Смотрите артефакты теста.")
@@ -0,0 +1,75 @@
+"""Встроенный параллельный режим: шардирование тестов по процессам pytest.
+
+Главный процесс с ``--workers N`` запускает N дочерних pytest с опцией
+``--shard K/N``. У каждого воркера свой пул драйверов и свой сервер на
+свободном порту, поэтому воркеры ничего не делят между собой.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+
+# Общий идентификатор прогона для воркеров (нужен плагину --write-back).
+RUN_ID_ENV = "FBANK_RUN_ID"
+
+# Коды выхода pytest, которые не считаются ошибкой воркера.
+_OK_CODES = (0, 5)
+
+
+def parse_workers(value):
+    if value == "auto":
+        return os.cpu_count() or 1
+    return int(value)
+
+
+def parse_shard(value):
+    index, total = (int(part) for part in value.split("/"))
+    if not 0 <= index < total:
+        raise ValueError(f"некорректный шард: {value}")
+    return index, total
+
+
+def select_shard(items, index, total):
+    """Разбивает тесты по кругу, чтобы тесты одного файла попадали в разные шарды."""
+    selected, deselected = [], []
+    for position, item in enumerate(items):
+        (selected if position % total == index else deselected).append(item)
+    return selected, deselected
+
+
+def _strip_workers_option(args):
+    result = []
+    skip_next = False
+    for arg in args:
+        if skip_next:
+            skip_next = False
+            continue
+        if arg == "--workers":
+            skip_next = True
+            continue
+        if arg.startswith("--workers="):
+            continue
+        result.append(arg)
+    return result
+
+
+def run_workers(config, workers):
+    args = _strip_workers_option(list(config.invocation_params.args))
+    env = {**os.environ, RUN_ID_ENV: uuid.uuid4().hex}
+    processes = []
+    for index in range(workers):
+        log = tempfile.TemporaryFile(mode="w+")
+        command = [sys.executable, "-m", "pytest", *args, f"--shard={index}/{workers}"]
+        processes.append((index, log, subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, env=env)))
+
+    exit_code = 0
+    for index, log, process in processes:
+        code = process.wait()
+        log.seek(0)
+        print(f"\n===== воркер {index + 1}/{workers} (код {code}) =====")
+        print(log.read(), end="")
+        log.close()
+        if code not in _OK_CODES:
+            exit_code = exit_code or code
+    return exit_code
@@ -0,0 +1,167 @@
+"""Бюджеты производительности: замеры загрузки страницы и взаимодействия.
+
+Фикстура perf снимает Navigation Timing, Paint Timing и Long Tasks через
+браузер, замеряет start_transfer до кликабельной карточки «Рубли» и путь
+от ввода суммы до отрисовки комиссии. perf.assert_within_budget() роняет
+тест при превышении бюджета; все замеры дописываются в историю
+(.perf/history.jsonl) для отчёта о трендах (benchmarks/perf_trend.py).
+"""
+import datetime
+import json
+import os
+import subprocess
+import time
+
+from harness.locators import FIND_JS, Locators, js_locator
+from harness.pages import TransferPage
+from harness.server import ROOT
+from harness.waits import set_script_timeout
+
+HISTORY_PATH = os.path.join(ROOT, ".perf", "history.jsonl")
+
+# Бюджеты по умолчанию, мс. Переопределяются опцией --perf-budget имя=мс.
+DEFAULT_BUDGETS = {
+    "dom_interactive": 1000,
+    "dom_content_loaded": 1500,
+    "load": 2000,
+    "first_contentful_paint": 1500,
+    "long_tasks_total": 200,
+    "start_transfer": 3000,
+    "transfer_to_commission": 200,
+}
+
+# Ставится до загрузки страницы: long task без наблюдателя не буферизуются.
+_LONG_TASKS_JS = """
+window.__fbankLongTasks = [];
+try {
+    new PerformanceObserver(list => {
+        for (const entry of list.getEntries()) window.__fbankLongTasks.push(entry.duration);
+    }).observe({type: "longtask", buffered: true});
+} catch (e) {}
+"""
+
+_NAVIGATION_JS = """
+const nav = performance.getEntriesByType("navigation")[0];
+const paints = {};
+for (const entry of performance.getEntriesByType("paint")) paints[entry.name] = entry.startTime;
+return {
+    dom_interactive: nav ? nav.domInteractive : null,
+    dom_content_loaded: nav ? nav.domContentLoadedEventEnd : null,
+    load: nav ? nav.loadEventEnd : null,
+    first_paint: paints["first-paint"] ?? null,
+    first_contentful_paint: paints["first-contentful-paint"] ?? null,
+    long_tasks_total: window.__fbankLongTasks
+        ? window.__fbankLongTasks.reduce((sum, d) => sum + d, 0) : null,
+};
+"""
+
+# Время от события input в поле суммы до появления новой комиссии в DOM.
+_TRANSFER_TIMING_JS = FIND_JS + """
+const [amountLocator, commissionLocator, amount, done] = arguments;
+const input = find(amountLocator);
+const before = find(commissionLocator).innerText;
+const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+const observer = new MutationObserver(() => {
+    const el = find(commissionLocator);
+    if (el && el.innerText !== before) {
+        observer.disconnect();
+        done(performance.now() - started);
+    }
+});
+observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+const started = performance.now();
+setValue.call(input, amount);
+input.dispatchEvent(new Event("input", {bubbles: true}));
+setTimeout(() => { observer.disconnect(); done(null); }, 5000);
+"""
+
+
+def parse_budget(value):
+    name, _, limit = value.partition("=")
+    if name not in DEFAULT_BUDGETS or not limit:
+        raise ValueError(f"ожидается имя=мс, имена: {', '.join(DEFAULT_BUDGETS)}")
+    return name, float(limit)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+class PerfRecorder:
+    """Замеры одного теста и их сверка с бюджетами."""
+
+    def __init__(self, driver, budgets, test_id):
+        self.driver = driver
+        self.budgets = budgets
+        self.test_id = test_id
+        self.metrics = {}
+        self._script_id = None
+        if hasattr(driver, "execute_cdp_cmd"):
+            self._script_id = driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": _LONG_TASKS_JS}
+            )["identifier"]
+
+    def navigation(self):
+        """Navigation Timing, Paint Timing и Long Tasks текущей страницы, мс."""
+        values = self.driver.execute_script(_NAVIGATION_JS)
+        self.metrics.update({name: value for name, value in values.items() if value is not None})
+        return values
+
+    def start_transfer(self, base_url, balance=30000, reserved=20001):
+        """Время от driver.get до клика по кликабельной карточке «Рубли»."""
+        page = TransferPage(self.driver)
+        # Бюджеты загрузки меряются на настоящей навигации, даже в --single-page.
+        page.single_page = False
+        started = time.perf_counter()
+        page.open(base_url, balance, reserved)
+        self.metrics["start_transfer"] = (time.perf_counter() - started) * 1000
+        self.navigation()
+        return page
+
+    def transfer_to_commission(self, amount):
+        """Время от ввода суммы до отрисовки комиссии; форма уже открыта с картой."""
+        set_script_timeout(self.driver, 10)
+        elapsed = self.driver.execute_async_script(
+            _TRANSFER_TIMING_JS,
+            js_locator(Locators.TRANSFER_AMOUNT_INPUT),
+            js_locator(Locators.COMMISSION_VALUE),
+            amount,
+        )
+        if elapsed is not None:
+            self.metrics["transfer_to_commission"] = elapsed
+        return elapsed
+
+    def violations(self):
+        return [
+            f"{name}: {self.metrics[name]:.0f} ms > бюджет {limit:.0f} ms"
+            for name, limit in self.budgets.items()
+            if name in self.metrics and self.metrics[name] > limit
+        ]
+
+    def assert_within_budget(self):
+        problems = self.violations()
+        assert not problems, "Превышены бюджеты производительности:\n" + "\n".join(problems)
+
+    def close(self):
+        if self._script_id is not None:
+            self.driver.execute_cdp_cmd(
+                "Page.removeScriptToEvaluateOnNewDocument", {"identifier": self._script_id}
+            )
+
+    def save(self, path=HISTORY_PATH):
+        if not self.metrics:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            "time": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "test": self.test_id,
+            "metrics": self.metrics,
+        }
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
@@ -0,0 +1,147 @@
+"""Плагин pytest: профиль времени по командам WebDriver (--profile-commands).
+
+Каждая команда записывается с ID теста, фазой (setup/call/teardown) и
+именем локатора из Locators, если он участвовал в команде. В конце
+прогона в каталог пишутся commands.json и commands.folded (формат
+folded stacks для flamegraph.pl и speedscope), а в отчёт — самые
+медленные команды и локаторы.
+"""
+import collections
+import json
+import os
+
+from harness.commands import LISTENERS_KEY
+from harness.locators import all_locators
+
+TOP = 10
+
+# Селектор -> имя локатора, чтобы узнавать локаторы в параметрах команд.
+_LOCATOR_NAMES = {}
+for _name, _locator in all_locators().items():
+    _LOCATOR_NAMES[_locator[1]] = _name
+    if _locator.fallback:
+        _LOCATOR_NAMES[_locator.fallback[1]] = _name
+
+
+def pytest_addoption(parser):
+    parser.getgroup("f-bank").addoption(
+        "--profile-commands",
+        nargs="?",
+        const="profile",
+        default=None,
+        metavar="DIR",
+        help="Записывать длительность каждой команды WebDriver в DIR (по умолчанию profile/).",
+    )
+
+
+def pytest_configure(config):
+    directory = config.getoption("--profile-commands")
+    if directory:
+        profiler = CommandProfiler(config, directory)
+        config.pluginmanager.register(profiler, "fbank-profiler")
+        config.stash.setdefault(LISTENERS_KEY, []).append(profiler.record)
+
+
+def locator_names(params):
+    """Имена локаторов, чьи селекторы встречаются в параметрах команды."""
+    names = []
+
+    def scan(value):
+        if isinstance(value, str):
+            name = _LOCATOR_NAMES.get(value)
+            if name and name not in names:
+                names.append(name)
+        elif isinstance(value, dict):
+            for item in value.values():
+                scan(item)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                scan(item)
+
+    scan(params)
+    return names
+
+
+class CommandProfiler:
+    def __init__(self, config, directory):
+        self.config = config
+        self.directory = directory
+        self.records = []
+        self.test = "<session>"
+        self.phase = "session"
+
+    def _track(self, item, phase):
+        self.test, self.phase = item.nodeid, phase
+
+    def pytest_runtest_setup(self, item):
+        self._track(item, "setup")
+
+    def pytest_runtest_call(self, item):
+        self._track(item, "call")
+
+    def pytest_runtest_teardown(self, item):
+        self._track(item, "teardown")
+
+    def record(self, command, params, duration, error):
+        self.records.append(
+            {
+                "test": self.test,
+                "phase": self.phase,
+                "command": command,
+                "locator": "+".join(locator_names(params)) or None,
+                "duration": duration,
+                "error": type(error).__name__ if error else None,
+            }
+        )
+
+    def _path(self, name):
+        shard = self.config.getoption("--shard")
+        if shard is not None:
+            stem, ext = os.path.splitext(name)
+            name = f"{stem}-{shard[0]}{ext}"
+        return os.path.join(self.directory, name)
+
+    def _totals(self, key):
+        totals = collections.defaultdict(lambda: [0, 0.0])
+        for record in self.records:
+            if record[key]:
+                totals[record[key]][0] += 1
+                totals[record[key]][1] += record["duration"]
+        return sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+
+    def pytest_sessionfinish(self):
+        if not self.records:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        summary = {
+            "commands": {name: {"count": n, "total": t} for name, (n, t) in self._totals("command")},
+            "locators": {name: {"count": n, "total": t} for name, (n, t) in self._totals("locator")},
+            "slowest": sorted(self.records, key=lambda r: r["duration"], reverse=True)[:TOP],
+        }
+        with open(self._path("commands.json"), "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "records": self.records}, f, ensure_ascii=False, indent=1)
+
+        stacks = collections.Counter()
+        for record in self.records:
+            frames = [record["test"], record["phase"], record["command"]]
+            if record["locator"]:
+                frames.append(record["locator"])
+            stacks[";".join(frames)] += int(record["duration"] * 1_000_000)
+        with open(self._path("commands.folded"), "w", encoding="utf-8") as f:
+            for stack, micros in sorted(stacks.items()):
+                f.write(f"{stack} {micros}\n")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.records:
+            return
+        terminalreporter.write_sep("-", "профиль команд WebDriver")
+        terminalreporter.write_line("самые медленные команды:")
+        for record in sorted(self.records, key=lambda r: r["duration"], reverse=True)[:TOP]:
+            terminalreporter.write_line(
+                f"  {record['duration']:7.3f} s  {record['command']:<24} "
+                f"{record['locator'] or '-':<28} {record['test']} ({record['phase']})"
+            )
+        terminalreporter.write_line("суммарно по локаторам:")
+        for name, (count, total) in self._totals("locator")[:TOP]:
+            terminalreporter.write_line(f"  {total:7.3f} s  {count:5d} x  {name}")
+        terminalreporter.write_line(f"профиль записан в {self.directory}/")
@@ -0,0 +1,230 @@
+"""Плагин pytest: память и CPU браузеров, потолки и отчёт по тестам.
+
+Фоновый поток раз в --resource-interval секунд снимает из /proc RSS и
+процессорное время всего дерева процессов каждого драйвера пула
+(chromedriver или geckodriver, браузер, рендереры). По замерам:
+
+- у каждого теста есть пиковый RSS браузеров, CPU-время и средняя загрузка
+  CPU. Они попадают в junit как свойства теста, а с --resource-report
+  ещё и в таблицу в конце прогона;
+- драйвер, дерево которого превысило --max-browser-rss, закрывается после
+  теста, и следующий тест получает новый браузер;
+- если браузеры воркера загружают CPU выше --max-browser-cpu, воркер перед
+  следующим тестом ждёт, пока нагрузка не спадёт (не дольше THROTTLE_LIMIT).
+
+Экономный профиль запуска браузера включает опция --lean-browser.
+Работает только в Linux, без /proc замеры не снимаются.
+"""
+import os
+import threading
+import time
+
+import pytest
+
+THROTTLE_LIMIT = 10.0
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("f-bank")
+    group.addoption(
+        "--lean-browser",
+        action="store_true",
+        default=False,
+        help="Экономный профиль браузера: окно 1280x800, без GPU и расширений, один процесс рендерера.",
+    )
+    group.addoption(
+        "--max-browser-rss",
+        type=float,
+        default=None,
+        metavar="МБ",
+        help="Потолок RSS дерева процессов драйвера; превысивший его браузер пересоздаётся после теста.",
+    )
+    group.addoption(
+        "--max-browser-cpu",
+        type=float,
+        default=None,
+        metavar="ПРОЦЕНТЫ",
+        help="Потолок загрузки CPU браузерами воркера; выше него воркер ждёт перед следующим тестом.",
+    )
+    group.addoption(
+        "--resource-interval",
+        type=float,
+        default=0.5,
+        metavar="С",
+        help="Интервал замеров памяти и CPU браузеров.",
+    )
+    group.addoption(
+        "--resource-report",
+        action="store_true",
+        default=False,
+        help="Показать память и CPU браузеров по тестам.",
+    )
+
+
+def pytest_configure(config):
+    if os.path.isdir("/proc/self"):
+        config.pluginmanager.register(ResourceMonitor(config), "fbank-resources")
+
+
+# --- Замеры по /proc ---
+def read_processes():
+    """{pid: (ppid, CPU-время в с, RSS в байтах)} всех процессов системы."""
+    processes = {}
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                # Имя процесса в скобках может содержать пробелы.
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        # Поля с 3-го: ppid — 4-е, utime/stime/cutime/cstime — 14–17-е, rss — 24-е.
+        cpu = sum(int(value) for value in fields[11:15]) / _CLOCK_TICKS
+        processes[int(pid)] = (int(fields[1]), cpu, int(fields[21]) * _PAGE_SIZE)
+    return processes
+
+
+def tree_usage(root_pid, processes=None):
+    """(RSS в МБ, CPU-время в с) процесса и всех его потомков."""
+    if processes is None:
+        processes = read_processes()
+    children = {}
+    for pid, (ppid, _, _) in processes.items():
+        children.setdefault(ppid, []).append(pid)
+    rss, cpu, stack = 0, 0.0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        if pid in processes:
+            cpu += processes[pid][1]
+            rss += processes[pid][2]
+    return rss / 2 ** 20, cpu
+
+
+def driver_pid(driver):
+    """PID процесса драйвера (chromedriver, geckodriver) или None для удалённого."""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+
+class ResourceMonitor:
+    def __init__(self, config):
+        self.config = config
+        self.interval = config.getoption("--resource-interval")
+        self.max_rss = config.getoption("--max-browser-rss")
+        self.max_cpu = config.getoption("--max-browser-cpu")
+        self.tests = {}
+        self.test = None
+        self.cpu_load = 0.0
+        self.retired = 0
+        self.throttled = 0
+        self.throttle_time = 0.0
+        self._last_cpu = {}
+        self._over_rss = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _pool(self):
+        return getattr(self.config, "_driver_pool", None)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        """Один замер всех драйверов пула; память и CPU выданных пишутся текущему тесту."""
+        pool = self._pool()
+        if pool is None:
+            return
+        busy = set(pool.in_use())
+        drivers = busy | set(pool.idle())
+        with self._lock:
+            now = time.perf_counter()
+            processes = read_processes()
+            load, test_rss, test_cpu = 0.0, 0.0, 0.0
+            for driver in drivers:
+                pid = driver_pid(driver)
+                if pid is None or pid not in processes:
+                    continue
+                rss, cpu = tree_usage(pid, processes)
+                previous = self._last_cpu.get(pid)
+                self._last_cpu[pid] = (now, cpu)
+                spent = cpu - previous[1] if previous else 0.0
+                if previous and now > previous[0]:
+                    load += spent / (now - previous[0]) * 100
+                if driver in busy:
+                    test_rss += rss
+                    test_cpu += spent
+                    if self.max_rss is not None and rss > self.max_rss:
+                        self._over_rss.add(driver)
+            self.cpu_load = load
+            entry = self.tests.get(self.test)
+            if entry is not None:
+                entry["peak_rss"] = max(entry["peak_rss"], test_rss)
+                entry["cpu"] += test_cpu
+
+    # --- Жизненный цикл ---
+    def pytest_sessionstart(self, session):
+        self._thread.start()
+
+    def pytest_sessionfinish(self, session):
+        self._stop.set()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        self._throttle()
+        with self._lock:
+            self.test = item.nodeid
+            self.tests[item.nodeid] = {"peak_rss": 0.0, "cpu": 0.0, "started": time.perf_counter(), "wall": 0.0}
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_call(self, item):
+        # Замер сразу после выдачи драйвера: короткие тесты тоже получают цифры.
+        self.sample()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_teardown(self, item):
+        # До teardown фикстур, пока драйвер ещё выдан тесту.
+        self.sample()
+        with self._lock:
+            self.test = None
+            entry = self.tests[item.nodeid]
+            entry["wall"] = time.perf_counter() - entry["started"]
+            over, self._over_rss = self._over_rss, set()
+        pool = self._pool()
+        for driver in over:
+            if pool is not None:
+                pool.retire(driver)
+                self.retired += 1
+        if entry["peak_rss"]:
+            item.user_properties.append(("browser_peak_rss_mb", round(entry["peak_rss"], 1)))
+            item.user_properties.append(("browser_cpu_s", round(entry["cpu"], 3)))
+
+    def _throttle(self):
+        if self.max_cpu is None or self.cpu_load <= self.max_cpu:
+            return
+        self.throttled += 1
+        started = time.perf_counter()
+        while self.cpu_load > self.max_cpu and time.perf_counter() - started < THROTTLE_LIMIT:
+            time.sleep(self.interval)
+            self.sample()
+        self.throttle_time += time.perf_counter() - started
+
+    # --- Отчёт ---
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.retired or self.throttled:
+            terminalreporter.write_line(
+                f"потолки ресурсов: браузеров пересоздано по памяти {self.retired}, "
+                f"пауз по CPU {self.throttled} ({self.throttle_time:.1f} s)"
+            )
+        measured = {nodeid: entry for nodeid, entry in self.tests.items() if entry["peak_rss"]}
+        if not measured or not self.config.getoption("--resource-report"):
+            return
+        terminalreporter.write_sep("-", "ресурсы браузеров по тестам")
+        terminalreporter.write_line(f"{'RSS, МБ':>9}{'CPU, s':>9}{'CPU, %':>8}  тест")
+        for nodeid, entry in sorted(measured.items(), key=lambda pair: -pair[1]["peak_rss"]):
+            load = entry["cpu"] / entry["wall"] * 100 if entry["wall"] else 0.0
+            terminalreporter.write_line(f"{entry['peak_rss']:>9.1f}{entry['cpu']:>9.2f}{load:>8.0f}  {nodeid}")
@@ -0,0 +1,213 @@
+"""Сценарии из таблиц тест-кейсов FIRST.md…FOURTH.md и их исполнитель.
+
+Таблицы написаны для людей (шаги свободным текстом), поэтому входные
+данные и проверки лежат рядом в scenarios.json и ссылаются на строки
+таблиц по ID. При загрузке ID сверяются с таблицами, название кейса
+берётся из них же. Группа сценария — файл таблицы: в браузере на группу
+приходится одна загрузка страницы, между сценариями приложение только
+перемонтируется (TransferPage.reopen).
+
+Сценарий с "defect": true закрепляет известный дефект: его ожидания
+описывают текущее ошибочное поведение, и успех значит, что дефект на месте.
+"""
+import json
+import os
+import re
+from typing import NamedTuple, Optional
+
+from harness.pages import TransferPage
+from harness.server import ROOT
+from harness.waits import alert_text_if_present
+
+CASE_FILES = ("FIRST.md", "SECOND.md", "THIRD.md", "FOURTH.md")
+SCENARIOS_PATH = os.path.join(ROOT, "scenarios.json")
+
+# Столбцы таблиц по порядку; заголовки в файлах написаны вручную и
+# местами с опечатками, поэтому столбцы определяются по позиции.
+COLUMNS = ("ID", "Название", "Шаги выполнения", "Ожидаемый результат", "Фактический результат", "Статус")
+
+DEFAULT_BALANCE = 30000
+DEFAULT_RESERVED = 20001
+
+
+def _cells(line):
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def parse_cases(path):
+    """Строки таблицы тест-кейсов: ID -> {столбец из COLUMNS: текст}."""
+    with open(path, encoding="utf-8") as f:
+        lines = [line for line in f if line.lstrip().startswith("|")]
+    cases = {}
+    for line in lines[2:]:
+        row = dict(zip(COLUMNS, _cells(line)))
+        cases[row["ID"].strip("*")] = row
+    return cases
+
+
+def load_cases(root=ROOT):
+    """Все тест-кейсы по ID вместе с группой (именем файла без .md)."""
+    cases = {}
+    for name in CASE_FILES:
+        for case_id, row in parse_cases(os.path.join(root, name)).items():
+            cases[case_id] = (os.path.splitext(name)[0], row)
+    return cases
+
+
+# --- Проверки: имя в поле "expect" -> (state, alerts, ожидание) -> описание расхождения ---
+def _field(name):
+    def check(state, alerts, expected):
+        actual = getattr(state, name)
+        if actual != expected:
+            return f"{name} = {actual!r}, ожидалось {expected!r}"
+    return check
+
+
+def _commission_contains(state, alerts, expected):
+    if state.commission_text is None or expected not in state.commission_text:
+        return f"комиссия {state.commission_text!r} не содержит {expected!r}"
+
+
+def _amount_alpha(state, alerts, expected):
+    actual = (state.amount_value or "").isalpha()
+    if actual != expected:
+        return f"сумма {state.amount_value!r}: isalpha() = {actual}, ожидалось {expected}"
+
+
+def _card_alpha(state, alerts, expected):
+    if state.card_value.isalpha() != expected:
+        return f"номер карты {state.card_value!r}: isalpha() = {not expected}, ожидалось {expected}"
+
+
+def _card_digits(state, alerts, expected):
+    digits = len(state.card_value.replace(" ", ""))
+    if digits != expected:
+        return f"в номере карты {digits} цифр, ожидалось {expected}"
+
+
+def _card_excludes(state, alerts, expected):
+    found = sorted({char for char in state.card_value if char in expected})
+    if found:
+        return f"номер карты {state.card_value!r} содержит недопустимые символы {''.join(found)!r}"
+
+
+def _transfer_blocked(state, alerts, expected):
+    blocked = state.insufficient_funds or not state.button_enabled
+    if blocked != expected:
+        return f"перевод {'заблокирован' if blocked else 'доступен'}, ожидалось обратное"
+
+
+def _alert_contains(state, alerts, expected):
+    if not any(expected in alert for alert in alerts):
+        return f"нет alert с текстом {expected!r}, появились: {alerts!r}"
+
+
+def _no_alert(state, alerts, expected):
+    if expected and alerts:
+        return f"появился alert: {alerts!r}"
+
+
+CHECKS = {
+    **{name: _field(name) for name in (
+        "amount_present", "button_present", "button_enabled", "insufficient_funds", "commission",
+    )},
+    "commission_contains": _commission_contains,
+    "amount_alpha": _amount_alpha,
+    "card_alpha": _card_alpha,
+    "card_digits": _card_digits,
+    "card_excludes": _card_excludes,
+    "transfer_blocked": _transfer_blocked,
+    "alert_contains": _alert_contains,
+    "no_alert": _no_alert,
+}
+
+
+class Scenario(NamedTuple):
+    id: str
+    title: str
+    group: str
+    balance: float
+    reserved: float
+    card: Optional[str]
+    amount: Optional[str]
+    submit: bool
+    expect: dict
+    # Сценарий закрепляет известный дефект: ожидания описывают ошибочное поведение.
+    defect: bool = False
+
+    @property
+    def watches_alerts(self):
+        return self.submit or "no_alert" in self.expect
+
+    def check(self, state, alerts):
+        """Список расхождений состояния формы и alert с ожиданиями сценария."""
+        problems = (CHECKS[name](state, alerts, expected) for name, expected in self.expect.items())
+        return [problem for problem in problems if problem]
+
+
+def load_scenarios(path=SCENARIOS_PATH, root=ROOT):
+    """Сценарии из scenarios.json, сверенные с таблицами тест-кейсов."""
+    cases = load_cases(root)
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+
+    scenarios, seen = [], set()
+    for entry in entries:
+        case_id = entry["id"]
+        if case_id not in cases:
+            raise ValueError(f"{path}: {case_id} нет в таблицах {', '.join(CASE_FILES)}")
+        if case_id in seen:
+            raise ValueError(f"{path}: {case_id} описан дважды")
+        unknown = set(entry["expect"]) - set(CHECKS)
+        if unknown:
+            raise ValueError(f"{path}: {case_id}: неизвестные проверки {', '.join(sorted(unknown))}")
+        seen.add(case_id)
+        group, row = cases[case_id]
+        scenarios.append(Scenario(
+            id=case_id,
+            title=re.sub(r"\*\*", "", row["Название"]),
+            group=group,
+            balance=entry.get("balance", DEFAULT_BALANCE),
+            reserved=entry.get("reserved", DEFAULT_RESERVED),
+            card=entry.get("card"),
+            amount=entry.get("amount"),
+            submit=entry.get("submit", False),
+            expect=entry["expect"],
+            defect=entry.get("defect", False),
+        ))
+    return scenarios
+
+
+class ScenarioRunner:
+    """Выполняет сценарии в одном браузере: одна загрузка страницы на группу.
+
+    С TransferPage.single_page — одна загрузка на всё время работы.
+    """
+
+    def __init__(self, driver, base_url):
+        self.page = TransferPage(driver)
+        self.base_url = base_url
+        self._group = None
+
+    def run(self, scenario):
+        """Возвращает (TransferState, тексты alert) для сценария."""
+        try:
+            # В режиме single_page страница загружается один раз на модуль.
+            if self._group is None or (scenario.group != self._group and not self.page.single_page):
+                self.page.load(self.base_url)
+                self._group = scenario.group
+            state = self.page.reopen(scenario.balance, scenario.reserved, scenario.card, scenario.amount)
+            alerts = []
+            if scenario.submit:
+                alert = self.page.submit()
+                alerts.append(alert.text)
+                alert.accept()
+            elif scenario.watches_alerts:
+                text = alert_text_if_present(self.page.driver)
+                if text is not None:
+                    alerts.append(text)
+            return state, alerts
+        except BaseException:
+            # Состояние страницы неизвестно: следующий сценарий загрузит её заново.
+            self._group = None
+            raise
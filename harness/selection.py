@@ -0,0 +1,181 @@
+"""Плагин pytest: кеш результатов по хешам содержимого (--cached-results).
+
+Ключ теста складывается из хешей:
+
+- приложения (index.html, vite.svg, assets/);
+- кода обвязки (harness/, conftest.py) без описаний локаторов;
+- исходника функции теста и кода модуля вне функций test_*;
+- параметров (например, сценария из scenarios.json) и опций запуска;
+- локаторов, которые тест использовал в прошлый раз.
+
+Если ключ совпал с ключом последнего успешного прогона, тест пропускается
+с пометкой «из кеша». Кешируются только успехи: упавшие тесты всегда
+выполняются заново. Какие локаторы использует тест, записывается по
+ходу прогона из параметров команд WebDriver (как в --profile-commands),
+поэтому после правки локатора перезапускаются только тесты, которые его
+касались. Тесты без браузера зависят от всех локаторов.
+"""
+import ast
+import functools
+import glob
+import hashlib
+import inspect
+import os
+
+import pytest
+
+from harness.commands import LISTENERS_KEY
+from harness.locators import Locators, all_locators
+from harness.profiler import locator_names
+from harness.server import ROOT
+
+CACHE_PREFIX = "fbank/results/"
+
+# Опции, от которых зависит результат теста.
+_KEY_OPTIONS = ("--engine", "--lean-browser", "--cdp", "--fast-setup", "--single-page", "--sweep-cases", "--sweep-seed", "--perf-budget")
+
+
+def pytest_addoption(parser):
+    parser.getgroup("f-bank").addoption(
+        "--cached-results",
+        action="store_true",
+        default=False,
+        help="Пропускать тесты, чей успешный результат уже есть в кеше для того же кода.",
+    )
+
+
+def pytest_configure(config):
+    if not config.getoption("--cached-results") or getattr(config, "cache", None) is None:
+        return
+    if config.getoption("--base-url"):
+        # Содержимое чужого сервера не захешировать: кеш был бы неверным.
+        return
+    selector = ResultCache(config)
+    config.pluginmanager.register(selector, "fbank-selection")
+    config.stash.setdefault(LISTENERS_KEY, []).append(selector.record)
+
+
+def _sha1(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def app_hash(root=ROOT):
+    paths = [os.path.join(root, "index.html"), os.path.join(root, "vite.svg")]
+    paths += sorted(glob.glob(os.path.join(root, "assets", "*")))
+    return _sha1(*(_sha1(os.path.relpath(path, root), _read(path)) for path in paths if os.path.exists(path)))
+
+
+def harness_hash(root=ROOT):
+    paths = sorted(glob.glob(os.path.join(root, "harness", "**", "*.py"), recursive=True))
+    paths += sorted(glob.glob(os.path.join(root, "harness", "js", "*.js")))
+    paths.append(os.path.join(root, "conftest.py"))
+    parts = []
+    for path in paths:
+        source = _read(path).decode("utf-8")
+        if path.endswith(os.path.join("harness", "locators.py")):
+            # Сами локаторы учитываются по отдельности, см. locator_hashes.
+            source = source.replace(inspect.getsource(Locators), "")
+        parts.append(_sha1(os.path.relpath(path, root), source))
+    return _sha1(*parts)
+
+
+def locator_hashes():
+    return {
+        name: _sha1(repr(tuple(locator)), repr(locator.fallback))
+        for name, locator in all_locators().items()
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _module_sources(path):
+    """(код модуля вне функций test_*, {имя функции: её исходник})."""
+    source = _read(path).decode("utf-8")
+    lines = source.splitlines(keepends=True)
+    tests = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.FunctionDef) and node.name.startswith("test"):
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list]) - 1
+            tests[node.name] = (start, node.end_lineno)
+    shared = [line for number, line in enumerate(lines)
+              if not any(start <= number < end for start, end in tests.values())]
+    return "".join(shared), {name: "".join(lines[start:end]) for name, (start, end) in tests.items()}
+
+
+def source_hash(item):
+    shared, tests = _module_sources(str(item.path))
+    name = getattr(item, "originalname", item.name)
+    callspec = getattr(item, "callspec", None)
+    params = repr(sorted(callspec.params.items())) if callspec else ""
+    return _sha1(shared, tests.get(name, item.name), params)
+
+
+class ResultCache:
+    def __init__(self, config):
+        self.config = config
+        options = repr([config.getoption(option) for option in _KEY_OPTIONS])
+        self.base = _sha1(app_hash(), harness_hash(), options)
+        self.locators = locator_hashes()
+        self.items = {}
+        self.used = {}
+        self.passed = set()
+        self.not_passed = set()
+        self.cached = 0
+        self.test = None
+
+    def _cache_key(self, nodeid):
+        return CACHE_PREFIX + hashlib.sha1(nodeid.encode("utf-8")).hexdigest()[:20]
+
+    def _key(self, item, locators):
+        names = sorted(self.locators) if locators is None else sorted(locators)
+        return _sha1(self.base, source_hash(item), *(name + self.locators.get(name, "?") for name in names))
+
+    # --- Выбор тестов ---
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items):
+        for item in items:
+            self.items[item.nodeid] = item
+            entry = self.config.cache.get(self._cache_key(item.nodeid), None)
+            if entry and entry["key"] == self._key(item, entry["locators"]):
+                item.add_marker(pytest.mark.skip(reason="из кеша: passed, код и приложение не менялись"))
+                self.cached += 1
+
+    # --- Локаторы, использованные тестом ---
+    def pytest_runtest_setup(self, item):
+        self.test = item.nodeid
+        self.used[item.nodeid] = set()
+
+    def record(self, command, params, duration, error):
+        if self.test is not None and params:
+            self.used[self.test].update(locator_names(params))
+
+    # --- Сохранение успехов ---
+    def pytest_runtest_logreport(self, report):
+        if report.failed or report.skipped:
+            self.not_passed.add(report.nodeid)
+        elif report.when == "call":
+            self.passed.add(report.nodeid)
+
+    def pytest_runtest_logfinish(self, nodeid):
+        self.test = None
+
+    def pytest_sessionfinish(self, session):
+        for nodeid in self.passed - self.not_passed:
+            item = self.items[nodeid]
+            # Без драйвера локаторы не видны в командах: тест зависит от всех.
+            locators = sorted(self.used[nodeid]) if "driver_pool" in item.fixturenames else None
+            self.config.cache.set(
+                self._cache_key(nodeid), {"key": self._key(item, locators), "locators": locators}
+            )
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.cached:
+            terminalreporter.write_line(f"кеш результатов: пропущено тестов {self.cached}")
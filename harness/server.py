@@ -0,0 +1,289 @@
+"""Локальный HTTP-сервер со статикой приложения для тестов.
+
+Все файлы читаются с диска один раз при старте и хранятся в памяти вместе
+с заранее сжатыми вариантами (gzip и, если установлен пакет brotli, br).
+Ассеты с хешем в имени отдаются с immutable-кешем, index.html — с ETag.
+
+StaticServer — многопоточный сервер на http.server, AsyncStaticServer —
+тот же протокол на asyncio в одном потоке. Оба отдают тела только из
+памяти, так что заголовки и тело всегда от одной версии файла.
+Сравнение: benchmarks/server_bench.py.
+"""
+import argparse
+import asyncio
+import collections
+import functools
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import brotli
+except ImportError:  # brotli не обязателен: без него отдаём только gzip
+    brotli = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Сжимать имеет смысл только текстовые ресурсы заметного размера.
+_COMPRESSIBLE = ("text/", "application/javascript", "image/svg+xml")
+_MIN_COMPRESS_SIZE = 1024
+
+
+class Resource:
+    """Файл в памяти: тело, ETag и сжатые варианты по Content-Encoding."""
+
+    def __init__(self, body, content_type, cache_control):
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.etag = '"%s"' % hashlib.sha1(body).hexdigest()[:20]
+        self.variants = {"identity": body}
+        if content_type.startswith(_COMPRESSIBLE) and len(body) >= _MIN_COMPRESS_SIZE:
+            self.variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(body, quality=11)
+
+    def negotiate(self, accept_encoding):
+        accepted = {part.split(";")[0].strip() for part in accept_encoding.split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.variants:
+                return encoding
+        return "identity"
+
+
+def _content_type(path):
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type == "application/javascript":
+        content_type += "; charset=utf-8"
+    return content_type
+
+
+@functools.lru_cache(maxsize=None)
+def load_site(root=ROOT):
+    """Читает index.html, vite.svg и assets/ в словарь URL-путь -> Resource."""
+    site = {}
+
+    def add(url_path, file_path, cache_control):
+        with open(file_path, "rb") as f:
+            site[url_path] = Resource(f.read(), _content_type(file_path), cache_control)
+
+    add("/index.html", os.path.join(root, "index.html"), REVALIDATE)
+    site["/"] = site["/index.html"]
+    svg = os.path.join(root, "vite.svg")
+    if os.path.exists(svg):
+        add("/vite.svg", svg, REVALIDATE)
+    assets = os.path.join(root, "assets")
+    for name in sorted(os.listdir(assets)):
+        add(f"/assets/{name}", os.path.join(assets, name), IMMUTABLE)
+    return site
+
+
+def plan_response(site, path, headers):
+    """Ответ на GET/HEAD: (код, заголовки, Resource или None, кодировка тела)."""
+    resource = site.get(path.split("?", 1)[0].split("#", 1)[0])
+    if resource is None:
+        return 404, [("Content-Length", "0")], None, None
+
+    if headers.get("If-None-Match") == resource.etag:
+        return 304, [("ETag", resource.etag), ("Cache-Control", resource.cache_control)], None, None
+
+    encoding = resource.negotiate(headers.get("Accept-Encoding", ""))
+    response_headers = [
+        ("Content-Type", resource.content_type),
+        ("Content-Length", str(len(resource.variants[encoding]))),
+        ("Cache-Control", resource.cache_control),
+        ("ETag", resource.etag),
+        ("Vary", "Accept-Encoding"),
+    ]
+    if encoding != "identity":
+        response_headers.append(("Content-Encoding", encoding))
+    return 200, response_headers, resource, encoding
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    site = {}
+    statuses = None
+    # Заголовки и тело уходят двумя записями; с Nagle вторая ждёт delayed ACK
+    # клиента (~40 мс) на каждом keep-alive запросе.
+    disable_nagle_algorithm = True
+
+    def send_response(self, code, message=None):
+        with self.statuses_lock:
+            self.statuses[code] += 1
+        super().send_response(code, message)
+
+    def do_GET(self):
+        self._send(head=False)
+
+    def do_HEAD(self):
+        self._send(head=True)
+
+    def _send(self, head):
+        status, headers, resource, encoding = plan_response(self.site, self.path, self.headers)
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if resource is not None and not head:
+            self.wfile.write(resource.variants[encoding])
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ThreadingServer(ThreadingHTTPServer):
+    # Очередь listen() по умолчанию — 5: при одновременном подключении
+    # десятков клиентов лишние SYN теряются и повторяются через секунду.
+    request_queue_size = 128
+
+
+class StaticServer:
+    """Многопоточный сервер статики на свободном порту в фоновом потоке."""
+
+    def __init__(self, root=ROOT, host="127.0.0.1", port=0):
+        # Счётчик ответов по кодам: по нему режим нагрузки считает ошибки сервера.
+        self.statuses = collections.Counter()
+        handler = type("Handler", (_Handler,), {
+            "site": load_site(root), "statuses": self.statuses, "statuses_lock": threading.Lock(),
+        })
+        self._httpd = _ThreadingServer((host, port), handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self.ready = threading.Event()
+
+    def _serve(self):
+        self.ready.set()
+        self._httpd.serve_forever(poll_interval=0.1)
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, timeout=5):
+        self._thread.start()
+        if not self.ready.wait(timeout):
+            raise RuntimeError("Сервер статики не запустился")
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+
+class AsyncStaticServer:
+    """Сервер статики на asyncio (HTTP/1.1, keep-alive) в фоновом потоке."""
+
+    def __init__(self, root=ROOT, host="127.0.0.1", port=0):
+        self.site = load_site(root)
+        self.statuses = collections.Counter()
+        self._host, self._port = host, port
+        self._loop = asyncio.new_event_loop()
+        self._server = None
+        self._connections = {}
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self.ready = threading.Event()
+
+    def _serve(self):
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self._host, self._port)
+        )
+        self.ready.set()
+        self._loop.run_forever()
+
+    async def _handle(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().title()] = value.strip()
+                method, path, version = request_line.decode("latin-1").split()
+                keep_alive = version == "HTTP/1.1" and headers.get("Connection", "").lower() != "close"
+                await self._respond(writer, method, path, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _respond(self, writer, method, path, headers, keep_alive):
+        if method not in ("GET", "HEAD"):
+            status, response_headers, resource, encoding = 501, [("Content-Length", "0")], None, None
+        else:
+            status, response_headers, resource, encoding = plan_response(self.site, path, headers)
+        self.statuses[status] += 1
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        lines += [f"{name}: {value}" for name, value in response_headers]
+        if not keep_alive:
+            lines.append("Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if resource is not None and method == "GET":
+            writer.write(resource.variants[encoding])
+        await writer.drain()
+
+    @property
+    def url(self):
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, timeout=5):
+        self._thread.start()
+        if not self.ready.wait(timeout):
+            raise RuntimeError("Сервер статики не запустился")
+        return self
+
+    def stop(self):
+        async def shutdown():
+            self._server.close()
+            # Открытые keep-alive соединения сами не закроются: обработчики
+            # получат EOF и завершатся.
+            for writer in list(self._connections.values()):
+                writer.transport.abort()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+SERVERS = {"threaded": StaticServer, "asyncio": AsyncStaticServer}
+
+
+def main(argv=None):
+    """Отдельный процесс с сервером, печатает адрес (для бенчмарков)."""
+    parser = argparse.ArgumentParser(description="Сервер статики F-Bank")
+    parser.add_argument("--kind", choices=sorted(SERVERS), default="threaded")
+    parser.add_argument("--port", type=int, default=0)
+    args = parser.parse_args(argv)
+    server = SERVERS[args.kind](port=args.port).start()
+    print(server.url, flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Плагин pytest: сравнивает длительность каждого теста с прошлым прогоном.
+
+Длительность фазы call каждого теста хранится в кеше pytest под своим
+ключом (fbank/durations/<хеш nodeid>), поэтому воркеры --workers не
+затирают замеры друг друга.
+С опцией --timing-report в конце прогона печатается, сколько времени
+сэкономил (или потерял) каждый тест относительно предыдущего запуска.
+"""
+import hashlib
+
+CACHE_PREFIX = "fbank/durations/"
+
+
+def pytest_addoption(parser):
+    parser.getgroup("f-bank").addoption(
+        "--timing-report",
+        action="store_true",
+        default=False,
+        help="Показать время каждого теста в сравнении с прошлым прогоном.",
+    )
+
+
+def pytest_configure(config):
+    if getattr(config, "cache", None) is not None:
+        config.pluginmanager.register(DurationTracker(config), "fbank-timing")
+
+
+class DurationTracker:
+    def __init__(self, config):
+        self.config = config
+        self.previous = {}
+        self.current = {}
+
+    def _cache_key(self, nodeid):
+        return CACHE_PREFIX + hashlib.sha1(nodeid.encode("utf-8")).hexdigest()[:20]
+
+    def pytest_collection_modifyitems(self, items):
+        for item in items:
+            duration = self.config.cache.get(self._cache_key(item.nodeid), None)
+            if duration is not None:
+                self.previous[item.nodeid] = duration
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call":
+            self.current[report.nodeid] = report.duration
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.current:
+            return
+        for nodeid, duration in self.current.items():
+            self.config.cache.set(self._cache_key(nodeid), duration)
+        if not self.config.getoption("--timing-report"):
+            return
+
+        terminalreporter.write_sep("-", "время тестов относительно прошлого прогона")
+        total_saved = 0.0
+        for nodeid, duration in sorted(self.current.items()):
+            before = self.previous.get(nodeid)
+            if before is None:
+                terminalreporter.write_line(f"{duration:8.2f} s  {'(новый)':>20}  {nodeid}")
+                continue
+            saved = before - duration
+            total_saved += saved
+            terminalreporter.write_line(f"{duration:8.2f} s  было {before:6.2f}, {saved:+7.2f}  {nodeid}")
+        terminalreporter.write_line(f"итого сэкономлено: {total_saved:.2f} s")
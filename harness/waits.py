@@ -0,0 +1,150 @@
+"""Событийные ожидания вместо WebDriverWait с опросом раз в 0.5 s.
+
+В страницу через execute_async_script ставится MutationObserver, который
+проверяет условие на каждое изменение DOM и возвращает результат сразу,
+как только условие выполнилось. Отрицательные проверки (is_absent) ждут,
+пока React закончит рендер (DOM затих), и проверяют отсутствие один раз.
+"""
+from selenium.common.exceptions import (
+    NoAlertPresentException,
+    TimeoutException,
+    UnexpectedAlertPresentException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from harness.locators import FIND_JS, js_locator
+
+# Сколько DOM должен простоять без изменений, чтобы считать рендер законченным.
+SETTLE_MS = 50
+# Запас к таймауту скрипта, чтобы таймаут срабатывал внутри JS, а не в драйвере.
+SCRIPT_TIMEOUT_MARGIN = 5
+
+WAIT_JS = FIND_JS + """
+const [locator, condition, text, timeoutMs, settleMs, done] = arguments;
+
+function visible(el) {
+    if (!el.isConnected) return false;
+    const style = getComputedStyle(el);
+    if (style.visibility === "hidden" || style.display === "none") return false;
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+function check() {
+    const el = find(locator);
+    switch (condition) {
+        case "present": return el;
+        case "visible": return el && visible(el) ? el : null;
+        case "clickable": return el && visible(el) && !el.disabled ? el : null;
+        case "text": return el && (el.innerText || el.textContent).includes(text) ? el : null;
+    }
+}
+
+let observer, deadline, quiet;
+function finish(value) {
+    observer.disconnect();
+    clearTimeout(deadline);
+    clearTimeout(quiet);
+    done(value);
+}
+const target = document.documentElement;
+const options = {childList: true, subtree: true, attributes: true, characterData: true};
+
+if (condition === "absent" || condition === "settled") {
+    // Ждём, пока React закончит рендер: DOM не меняется settleMs миллисекунд.
+    const result = () => condition === "settled" || find(locator) === null;
+    const settled = () => { quiet = setTimeout(() => finish(result()), settleMs); };
+    observer = new MutationObserver(() => { clearTimeout(quiet); settled(); });
+    observer.observe(target, options);
+    deadline = setTimeout(() => finish(result()), timeoutMs);
+    requestAnimationFrame(settled);
+} else {
+    const found = check();
+    if (found) { done(found); return; }
+    observer = new MutationObserver(() => { const el = check(); if (el) finish(el); });
+    observer.observe(target, options);
+    deadline = setTimeout(() => finish(check()), timeoutMs);
+}
+"""
+
+def set_script_timeout(driver, seconds):
+    """Таймаут асинхронных скриптов сессии; запрос уходит, только если значение меняется.
+
+    Последнее выставленное значение хранится на драйвере, поэтому код,
+    меняющий таймаут напрямую через driver.set_script_timeout, должен идти
+    через эту функцию.
+    """
+    if getattr(driver, "_fbank_script_timeout", None) != seconds:
+        driver.set_script_timeout(seconds)
+        driver._fbank_script_timeout = seconds
+
+
+def _run(driver, locator, condition, timeout, text=""):
+    set_script_timeout(driver, timeout + SCRIPT_TIMEOUT_MARGIN)
+    return driver.execute_async_script(
+        WAIT_JS, js_locator(locator), condition, text, int(timeout * 1000), SETTLE_MS
+    )
+
+
+def _wait(driver, locator, condition, timeout, text=""):
+    element = _run(driver, locator, condition, timeout, text)
+    if element is None:
+        raise TimeoutException(f"Условие '{condition}' не выполнилось за {timeout} s для {locator}")
+    return element
+
+
+def wait_present(driver, locator, timeout=10):
+    return _wait(driver, locator, "present", timeout)
+
+
+def wait_visible(driver, locator, timeout=10):
+    return _wait(driver, locator, "visible", timeout)
+
+
+def wait_clickable(driver, locator, timeout=10):
+    return _wait(driver, locator, "clickable", timeout)
+
+
+def wait_text(driver, locator, text, timeout=10):
+    return _wait(driver, locator, "text", timeout, text)
+
+
+def is_absent(driver, locator, timeout=2):
+    """Быстрая отрицательная проверка: ждёт окончания рендера, а не таймаута."""
+    return _run(driver, locator, "absent", timeout)
+
+
+def wait_settled(driver, timeout=2):
+    """Ждёт, пока DOM перестанет меняться, то есть React закончит рендер."""
+    _run(driver, (By.CSS_SELECTOR, ":root"), "settled", timeout)
+
+
+def alert_text_if_present(driver):
+    """Закрывает alert, если он появился после рендера, и возвращает его текст."""
+    try:
+        wait_settled(driver)
+    except UnexpectedAlertPresentException as e:
+        # Драйвер по умолчанию сам закрывает неожиданный alert и сообщает его текст.
+        return e.alert_text or ""
+    try:
+        alert = driver.switch_to.alert
+    except NoAlertPresentException:
+        return None
+    text = alert.text
+    alert.accept()
+    return text
+
+
+def wait_alert(driver, timeout=10):
+    """alert() в обработчике клика синхронный, поэтому обычно он уже открыт."""
+    cdp = getattr(driver, "fbank_cdp", None)
+    if cdp is not None:
+        # В режиме CDP открытие диалога приходит событием, опрашивать не нужно.
+        if cdp.dialogs.wait(timeout) is None:
+            raise TimeoutException(f"alert не появился за {timeout} s")
+        return driver.switch_to.alert
+    try:
+        return driver.switch_to.alert
+    except NoAlertPresentException:
+        return WebDriverWait(driver, timeout, poll_frequency=0.05).until(EC.alert_is_present())
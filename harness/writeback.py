@@ -0,0 +1,214 @@
+"""Плагин pytest: записывает результаты в таблицы FIRST.md…FOURTH.md по ходу прогона.
+
+С опцией --write-back после каждого теста обновляются столбцы «Фактический
+результат» и «Статус» строки его тест-кейса. ID кейса берётся из параметра
+scenario (scenarios_test.py, logic_test.py) или из комментария
+«# Тест TC-x.y» над функцией теста.
+
+Если кейс проверяют несколько тестов, строка собирается из всех их
+результатов в этом прогоне: Fail, если упал хоть один. Результаты прогона
+копятся в .writeback.json. Воркеры --workers пишут в него и в таблицы под
+общей файловой блокировкой и узнают свой прогон по FBANK_RUN_ID.
+
+Тест с меткой defect (или сценарий с "defect": true) закрепляет известный
+дефект: его успех значит, что дефект воспроизводится. Для такого кейса
+статус остаётся Fail, а описание дефекта в «Фактическом результате» не
+трогается. Если такой тест упал, поведение изменилось, и что именно стало
+с дефектом, решает человек: строка не меняется, кейс попадает в сводку
+в конце прогона.
+"""
+import functools
+import inspect
+import json
+import os
+import re
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # без fcntl (Windows) параллельная запись не защищена
+    fcntl = None
+
+from harness.parallel import RUN_ID_ENV
+from harness.scenarios import CASE_FILES, COLUMNS
+from harness.server import ROOT
+
+STATE_PATH = os.path.join(ROOT, ".writeback.json")
+LOCK_PATH = os.path.join(ROOT, ".writeback.lock")
+
+_TC_COMMENT = re.compile(r"#\s*Тест\s+(TC-\d+\.\d+)")
+_EXCERPT_LENGTH = 120
+
+_ACTUAL = COLUMNS.index("Фактический результат")
+_STATUS = COLUMNS.index("Статус")
+
+
+def pytest_addoption(parser):
+    parser.getgroup("f-bank").addoption(
+        "--write-back",
+        action="store_true",
+        default=False,
+        help="Записывать статус и фактический результат в таблицы тест-кейсов *.md.",
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("--write-back"):
+        config.pluginmanager.register(ResultWriter(), "fbank-writeback")
+
+
+@functools.lru_cache(maxsize=None)
+def _source_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return f.readlines()
+
+
+def case_id(item):
+    """ID тест-кейса для теста или None."""
+    scenario = getattr(item, "callspec", None) and item.callspec.params.get("scenario")
+    if scenario is not None:
+        return scenario.id
+    function = getattr(item, "function", None)
+    if function is None:
+        return None
+    lines = _source_lines(inspect.getsourcefile(function))
+    # Комментарий стоит прямо над def (или над декораторами).
+    index = function.__code__.co_firstlineno - 2
+    while index >= 0 and lines[index].lstrip().startswith("@"):
+        index -= 1
+    match = _TC_COMMENT.search(lines[index]) if index >= 0 else None
+    return match.group(1) if match else None
+
+
+def _excerpt(report):
+    if report.passed:
+        return None
+    message = getattr(report.longrepr, "reprcrash", None)
+    text = message.message if message is not None else str(report.longrepr)
+    text = " ".join(text.split())
+    if len(text) > _EXCERPT_LENGTH:
+        text = text[:_EXCERPT_LENGTH - 1] + "…"
+    return text
+
+
+def summarize(results, defect=False):
+    """Статус и фактический результат кейса по результатам его тестов.
+
+    None вместо значения — столбец не менять.
+    """
+    failed = [result for result in results if result["outcome"] == "failed"]
+    duration = sum(result["duration"] for result in results)
+    if defect:
+        return (None, None) if failed else ("Fail", None)
+    if failed:
+        return "Fail", f"Автотест: упал {failed[0]['name']} ({duration:.2f} s): {failed[0]['excerpt']}"
+    return "Pass", f"Автотест: пройдено тестов {len(results)} ({duration:.2f} s)"
+
+
+def _cell(raw, value):
+    """Новое содержимое ячейки с сохранением ширины столбца и выделения."""
+    value = value.replace("|", "\\|")
+    if raw.strip().startswith("**") and value in ("Pass", "Fail"):
+        value = f"**{value}**"
+    return " " + value.ljust(len(raw) - 2) + " "
+
+
+def update_row(path, tc, status, actual):
+    """Переписывает столбцы статуса и результата строки кейса; False, если её нет.
+
+    Столбец со значением None остаётся как есть.
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    for number, line in enumerate(lines):
+        cells = line.rstrip("\n").split("|")
+        # Ведущая и замыкающая пустые части от крайних «|».
+        if len(cells) != len(COLUMNS) + 2 or cells[1].strip().strip("*") != tc:
+            continue
+        if actual is not None:
+            cells[_ACTUAL + 1] = _cell(cells[_ACTUAL + 1], actual)
+        if status is not None:
+            cells[_STATUS + 1] = _cell(cells[_STATUS + 1], status)
+        updated = "|".join(cells) + ("\n" if line.endswith("\n") else "")
+        if updated == line:
+            return True
+        lines[number] = updated
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        os.replace(temporary, path)
+        return True
+    return False
+
+
+class _Lock:
+    def __enter__(self):
+        self._file = open(LOCK_PATH, "w")
+        if fcntl is not None:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        self._file.close()  # закрытие снимает блокировку
+
+
+class ResultWriter:
+    def __init__(self):
+        self.run_id = os.environ.setdefault(RUN_ID_ENV, uuid.uuid4().hex)
+        self.cases = {}
+        self.defects = set()
+        self.changed_defects = {}
+
+    def pytest_collection_modifyitems(self, items):
+        for item in items:
+            tc = case_id(item)
+            if tc is not None:
+                self.cases[item.nodeid] = tc
+                if item.get_closest_marker("defect") is not None:
+                    self.defects.add(tc)
+
+    def pytest_runtest_logreport(self, report):
+        tc = self.cases.get(report.nodeid)
+        if tc is None or report.skipped:
+            return
+        # Результат теста — фаза call; setup и teardown важны, только если упали.
+        if report.when != "call" and not report.failed:
+            return
+        self._publish(tc, {
+            "name": report.nodeid.split("::", 1)[-1],
+            "outcome": report.outcome,
+            "duration": report.duration,
+            "excerpt": _excerpt(report),
+        }, report.nodeid)
+
+    def _publish(self, tc, result, nodeid):
+        with _Lock():
+            try:
+                with open(STATE_PATH, encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+            if state.get("run_id") != self.run_id:
+                state = {"run_id": self.run_id, "cases": {}}
+            results = state["cases"].setdefault(tc, {})
+            if results.get(nodeid, {}).get("outcome") != "failed":
+                results[nodeid] = result
+            with open(STATE_PATH, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False, indent=1)
+
+            defect = tc in self.defects
+            status, actual = summarize(list(results.values()), defect)
+            if defect and result["outcome"] == "failed":
+                self.changed_defects[tc] = f"{result['name']}: {result['excerpt']}"
+            if status is None and actual is None:
+                return
+            for name in CASE_FILES:
+                if update_row(os.path.join(ROOT, name), tc, status, actual):
+                    break
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.changed_defects:
+            return
+        terminalreporter.write_sep("-", "закреплённые дефекты ведут себя иначе (таблицы не изменены)")
+        for tc, description in sorted(self.changed_defects.items()):
+            terminalreporter.write_line(f"{tc}  {description}")
@@ -0,0 +1,19 @@
+"""Сценарии формы перевода на уровне logic: бандл в jsdom, без Chrome.
+
+Сценарии те же, что в scenarios_test.py (scenarios.json). Запуск только
+этого уровня: pytest -m logic
+"""
+import pytest
+
+from harness.scenarios import load_scenarios
+
+pytestmark = pytest.mark.logic
+
+SCENARIOS = load_scenarios()
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=[scenario.id for scenario in SCENARIOS])
+def test_logic_scenario(logic, scenario):
+    state, alerts = logic.run(scenario.balance, scenario.reserved, scenario.card, scenario.amount, scenario.submit)
+    problems = scenario.check(state, alerts)
+    assert not problems, f"{scenario.id} {scenario.title}:\n" + "\n".join(problems)
@@ -0,0 +1,16 @@
+"""Бюджеты производительности загрузки и формы перевода (--perf-budget имя=мс)."""
+import pytest
+
+pytestmark = pytest.mark.perf
+
+
+def test_page_load_within_budget(perf, base_url):
+    perf.start_transfer(base_url)
+    perf.assert_within_budget()
+
+
+def test_transfer_interaction_within_budget(perf, base_url):
+    page = perf.start_transfer(base_url, balance=10000, reserved=0)
+    assert page.fill("1111222233334444").amount_present
+    assert perf.transfer_to_commission("999") is not None, "Комиссия не обновилась после ввода суммы"
+    perf.assert_within_budget()
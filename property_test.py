@@ -0,0 +1,99 @@
+"""Генеративная проверка комиссии и лимита против эталонной модели.
+
+Один драйвер и одна загрузка страницы на весь прогон: каждый случай —
+это один вызов TransferPage.probe без перезагрузки и ровно одна команда
+WebDriver (тест это проверяет). Число случаев и seed
+задаются опциями --sweep-cases и --sweep-seed.
+"""
+import random
+
+from harness import model
+from harness.pages import TransferPage
+
+CARD = "1111222233334444"
+
+# Точки из тест-кейсов: TC-3.3, TC-4.1, TC-4.5, TC-2.1, TC-3.1, TC-1.3.
+KNOWN_CASES = [
+    ("30000", "20001", "999"),
+    ("9999", "0", "9099"),
+    ("10000", "0", "1000"),
+    ("1000", "0", "150.55"),
+    ("10000", "0", "10000"),
+    ("10000", "1000", "9000"),
+]
+
+
+def _money(rng, upper):
+    if rng.random() < 0.3:
+        return f"{rng.uniform(0, upper):.2f}"
+    return str(rng.randint(0, upper))
+
+
+def _amount(rng, available):
+    roll = rng.random()
+    if roll < 0.4:
+        # Около границы amount + commission == available.
+        return str(int(available / 1.1) + rng.randint(-3, 3))
+    if roll < 0.55:
+        return str(rng.randint(1, 1200) * 100 + rng.choice((-1, 0, 1)))
+    if roll < 0.7:
+        return f"{rng.randint(0, 20000)}.{rng.randint(0, 99):02d}"
+    if roll < 0.8:
+        return str(-rng.randint(0, 5000))
+    return str(rng.randint(0, 120000))
+
+
+def generate_cases(rng, count):
+    yield from KNOWN_CASES
+    for _ in range(count):
+        balance = _money(rng, 100000)
+        reserved = rng.choice(("0", _money(rng, int(float(balance)))))
+        available = float(balance) - float(reserved)
+        yield balance, reserved, _amount(rng, available)
+
+
+def check_case(state, balance, reserved, amount_text):
+    """Список расхождений UI с моделью для одного случая."""
+    amount = model.parse_amount(amount_text)
+    expected_commission = model.commission(amount)
+    sufficient = model.is_sufficient(model.parse_param(balance), model.parse_param(reserved), amount)
+
+    problems = []
+    if state.commission != expected_commission:
+        problems.append(f"комиссия {state.commission}, ожидалась {expected_commission}")
+    if state.insufficient_funds == sufficient:
+        problems.append(f"сообщение о нехватке средств: {state.insufficient_funds}, ожидалось {not sufficient}")
+    if state.button_present != sufficient:
+        problems.append(f"кнопка 'Перевести': {state.button_present}, ожидалось {sufficient}")
+    return problems
+
+
+def test_commission_and_limit_sweep(browser, base_url, request):
+    cases = request.config.getoption("--sweep-cases")
+    seed = request.config.getoption("--sweep-seed")
+
+    page = TransferPage(browser).open(base_url)
+    assert page.fill(CARD).amount_present
+
+    # Считаем команды WebDriver: на случай должна уходить ровно одна.
+    commands = []
+    execute = browser.execute
+
+    def counting_execute(driver_command, params=None):
+        commands.append(driver_command)
+        return execute(driver_command, params)
+
+    mismatches = []
+    probes = 0
+    browser.execute = counting_execute
+    try:
+        for balance, reserved, amount in generate_cases(random.Random(seed), cases):
+            state = page.probe(balance, reserved, amount)
+            probes += 1
+            for problem in check_case(state, balance, reserved, amount):
+                mismatches.append(f"balance={balance} reserved={reserved} amount={amount!r}: {problem}")
+    finally:
+        browser.execute = execute
+
+    assert not mismatches, f"seed={seed}, расхождений: {len(mismatches)}\n" + "\n".join(mismatches[:20])
+    assert len(commands) == probes, f"{len(commands)} команд WebDriver на {probes} случаев"
@@ -0,0 +1,26 @@
+"""Сценарии из scenarios.json (кейсы FIRST.md…FOURTH.md) в браузере.
+
+Один драйвер на модуль и одна загрузка страницы на группу сценариев;
+сценарии внутри группы только перемонтируют приложение. Те же сценарии
+на уровне logic выполняет logic_test.py.
+"""
+import pytest
+
+from harness.scenarios import ScenarioRunner, load_scenarios
+
+SCENARIOS = load_scenarios()
+
+
+@pytest.fixture(scope="module")
+def scenario_runner(driver_pool, base_url):
+    driver = driver_pool.acquire()
+    yield ScenarioRunner(driver, base_url)
+    driver_pool.release(driver)
+
+
+@pytest.mark.ui
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=[scenario.id for scenario in SCENARIOS])
+def test_scenario(scenario_runner, scenario):
+    state, alerts = scenario_runner.run(scenario)
+    problems = scenario.check(state, alerts)
+    assert not problems, f"{scenario.id} {scenario.title}:\n" + "\n".join(problems)